@@ -1,7 +1,10 @@
-from typing import TYPE_CHECKING, Callable, Any
+from typing import TYPE_CHECKING, Callable, Any, Generator, Literal
+from functools import cached_property, cache
+from contextlib import contextmanager
 from zipfile import ZipFile as _ZipFile
-from functools import cached_property
+from io import RawIOBase
 from dataclasses import dataclass
+from threading import RLock
 
 if TYPE_CHECKING:
     from .pc import Path
@@ -26,20 +29,260 @@ def temp(
 
 #========================================================
 
+class Lock:
+    """
+    Cross-process advisory file lock
+
+    Locks a sidecar file, so the locked file can be freely rewritten.
+    Reentrant within a process (nested calls reuse the outer lock).
+
+    Only writers create the sidecar, so reads leave no trace.
+    A shared lock is skipped if the sidecar doesn't exist (nothing has written with a lock yet).
+
+    Uses fcntl on unix and msvcrt on windows (exclusive only)
+    """
+
+    def __init__(self, path:str) -> None:
+
+        self.path = path
+
+        self._rlock = RLock()
+        self._depth = 0
+        self._fd = None
+
+    @staticmethod
+    @cache
+    def get(path:str) -> 'Lock':
+        """Get the shared lock for a path"""
+        return Lock(path + '.lock')
+
+    def _acquire(self, shared:bool) -> None:
+        from os import open, O_RDONLY, O_RDWR, O_CREAT
+
+        if shared:
+            try:
+                self._fd = open(self.path, O_RDONLY)
+            except FileNotFoundError:
+                return
+        else:
+            self._fd = open(self.path, O_RDWR | O_CREAT)
+
+        try:
+            from fcntl import flock, LOCK_SH, LOCK_EX
+
+            flock(self._fd, LOCK_SH if shared else LOCK_EX)
+
+        except ImportError:
+            from msvcrt import locking, LK_LOCK
+
+            while True:
+                try:
+                    locking(self._fd, LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after 10 seconds
+                    pass
+
+    def _release(self) -> None:
+        from os import close
+
+        if self._fd is None:
+            return
+
+        try:
+            from fcntl import flock, LOCK_UN
+
+            flock(self._fd, LOCK_UN)
+
+        except ImportError:
+            from msvcrt import locking, LK_UNLCK
+
+            locking(self._fd, LK_UNLCK, 1)
+
+        close(self._fd)
+
+        self._fd = None
+
+    @contextmanager
+    def __call__(self,
+        shared: bool = False
+    ) -> Generator[None, None, None]:
+
+        with self._rlock:
+
+            if self._depth == 0:
+                self._acquire(shared)
+
+            self._depth += 1
+
+            try:
+                yield
+
+            finally:
+
+                self._depth -= 1
+
+                if self._depth == 0:
+                    self._release()
+
+#========================================================
+# Compression
+
+codecs = Literal['gzip', 'lzma', 'zlib']
+
+codec_exts: dict[str, codecs] = {
+    'gz'  : 'gzip',
+    'gzip': 'gzip',
+    'xz'  : 'lzma',
+    'lzma': 'lzma',
+    'zz'  : 'zlib',
+    'zlib': 'zlib'
+}
+"""Codecs selected automatically by file extension"""
+
+class _ZlibFile(RawIOBase):
+    """Streaming zlib file (the zlib module only has one-shot helpers)"""
+
+    CHUNK = 64 * 1024
+
+    def __init__(self,
+        path: str,
+        mode: str,
+        level: int = -1
+    ) -> None:
+        from zlib import compressobj, decompressobj
+
+        self._mode = mode
+        self._file = open(path, mode)
+
+        if self.readable():
+            self._z = decompressobj()
+        else:
+            self._z = compressobj(level)
+
+        # If any compressed data has been read (an empty file is an empty stream, like gzip)
+        self._started = False
+
+    def readable(self) -> bool:
+        return ('r' in self._mode)
+
+    def writable(self) -> bool:
+        return not self.readable()
+
+    def readinto(self, b) -> int:
+
+        while not self._z.eof:
+
+            src = self._z.unconsumed_tail or self._file.read(self.CHUNK)
+
+            if not src:
+
+                if self._started:
+                    raise EOFError('Compressed file ended before the end-of-stream marker was reached')
+
+                break
+
+            self._started = True
+
+            # Only decompress as much as the caller asked for
+            out = self._z.decompress(src, len(b))
+
+            if out:
+                b[:len(out)] = out
+                return len(out)
+
+        return 0
+
+    def write(self, b) -> int:
+        self._file.write(self._z.compress(b))
+        return len(b)
+
+    def close(self) -> None:
+
+        if self.closed:
+            return
+
+        if self.writable():
+            self._file.write(self._z.flush())
+
+        self._file.close()
+
+        super().close()
+
+#========================================================
+
 class _Template:
 
     def __init__(self,
         path: 'Path',
-        default: Any = None
+        default: Any = None,
+        codec: None | codecs = None,
+        level: None | int = None
     ) -> None:
 
         self.path    = path
 
         self.default = default
 
+        self.codec: None | codecs = codec or codec_exts.get(path.ext)
+        """Compression codec (defaults to the codec of the extension)"""
+
+        self.level = level
+        """Compression level (codec default if None)"""
+
         # Make the parent dir of the output path
         path.parent.mkdir()
 
+    def open(self,
+        mode: Literal['r', 'w', 'rb', 'wb'] = 'r'
+    ):
+        """Open the file, transparently (de)compressing it as a stream"""
+        from io import TextIOWrapper, BufferedReader, BufferedWriter
+        import gzip
+        import lzma
+
+        if self.codec is None:
+            return self.path.open(mode)
+
+        if 'w' in mode:
+            self.path.parent.mkdir()
+
+        bmode = mode.replace('b', '') + 'b'
+
+        match self.codec:
+
+            case 'gzip':
+                f = gzip.open(
+                    filename = self.path.path,
+                    mode = bmode,
+                    compresslevel = 9 if (self.level is None) else self.level
+                )
+
+            case 'lzma':
+                f = lzma.open(
+                    filename = self.path.path,
+                    mode = bmode,
+                    # Only valid when compressing
+                    preset = None if ('r' in bmode) else self.level
+                )
+
+            case 'zlib':
+                raw = _ZlibFile(
+                    path = self.path.path,
+                    mode = bmode,
+                    level = -1 if (self.level is None) else self.level
+                )
+
+                if 'r' in bmode:
+                    f = BufferedReader(raw)
+                else:
+                    f = BufferedWriter(raw)
+
+        if 'b' in mode:
+            return f
+        else:
+            return TextIOWrapper(f, encoding='utf-8')
+
     parsed: Any
 
     save = Callable[[Any], None]
@@ -57,10 +300,26 @@ class _Template:
         
         return self.default
 
+    @property
+    def stat(self) -> None | tuple[int, int]:
+        """(size, mtime_ns) of the file, used to cheaply detect external changes"""
+        from os import stat
+
+        try:
+            st = stat(self.path.path)
+            return (st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+
+    @property
+    def lock(self) -> Lock:
+        """Cross-process advisory lock for this file"""
+        return Lock.get(self.path.path)
+
     @property
     def raw(self) -> bytes:
 
-        with self.path.open() as f:
+        with self.open() as f:
         
             raw: str = f.read()
 
@@ -85,7 +344,7 @@ class XML(_Template):
     def parsed(self) -> dict:
         from xmltodict import parse
 
-        with self.path.open() as f:
+        with self.open() as f:
 
             return parse(f.read())
 
@@ -94,7 +353,7 @@ class XML(_Template):
     ) -> None:
         from xmltodict import unparse
 
-        with self.path.open('w') as f:
+        with self.open('w') as f:
 
             data = unparse(data, pretty=True)
 
@@ -107,7 +366,7 @@ class PKL(_Template):
     def parsed(self):
         from dill import load
         
-        with self.path.open('rb') as f:
+        with self.open('rb') as f:
             return load(f)
 
     def save(self,
@@ -115,7 +374,7 @@ class PKL(_Template):
     ) -> None:
         from dill import dump
         
-        with self.path.open(mode='wb') as f:
+        with self.open(mode='wb') as f:
             dump(obj=value, file=f)
 
 class VHDX:
@@ -170,16 +429,18 @@ class JSON(_Template):
     def parsed(self):
         from json import load
 
-        return load(fp=self.path.open())
+        with self.open() as f:
+            return load(fp=f)
 
     def save(self, data: dict) -> None:
         from json import dump
 
-        dump(
-            obj = data,
-            fp = self.path.open(mode='w'),
-            indent = 3
-        )
+        with self.open(mode='w') as f:
+            dump(
+                obj = data,
+                fp = f,
+                indent = 3
+            )
 
 class INI(_Template):
     """.INI/.PROPERTIES File"""
@@ -212,12 +473,13 @@ class YAML(_Template):
     def save(self, data:dict) -> None:
         from yaml import dump
 
-        dump(
-            data = data, 
-            stream = self.path.open(mode='w'),
-            default_flow_style = False,
-            sort_keys = False
-        )
+        with self.open(mode='w') as f:
+            dump(
+                data = data, 
+                stream = f,
+                default_flow_style = False,
+                sort_keys = False
+            )
 
 class TXT(_Template):
     """.TXT File"""
@@ -225,11 +487,13 @@ class TXT(_Template):
     @property
     def parsed(self):
         """Read data from the txt file"""
-        return self.path.open(mode='r').read()
+        with self.open(mode='r') as f:
+            return f.read()
     
     def save(self, data:str) -> None:
         """Save data to the txt file"""
-        self.path.open(mode='w').write(str(data))
+        with self.open(mode='w') as f:
+            f.write(str(data))
 
 @dataclass
 class ZIP:
@@ -292,13 +556,13 @@ class CSV(_Template):
     def parsed(self):
         from csv import reader
 
-        with self.path.open() as csvfile:
+        with self.open() as csvfile:
             return reader(csvfile)
 
     def save(self, data:list[list]) -> None:
         from csv import writer
 
-        with self.path.open('w') as csvfile:
+        with self.open('w') as csvfile:
             writer(csvfile).writerows(data)
 
 class TOML(_Template):
@@ -308,13 +572,13 @@ class TOML(_Template):
     def parsed(self):
         from toml import load
 
-        with self.path.open() as f:
+        with self.open() as f:
             return load(f)
         
     def save(self, data:dict) -> None:
         from tomli_w import dump
 
-        with self.path.open('wb') as f:
+        with self.open('wb') as f:
             dump(data, f, indent=2)
 
 #========================================================
\ No newline at end of file
@@ -1,37 +1,150 @@
-from typing import Callable
+from collections import deque
+from threading import Lock, Condition
 
-class SharedBuffer:
+class BufferClosedError(Exception): ...
 
-    stop_when: Callable[[], bool] = lambda: False
+class SharedBuffer[T]:
     """
-    Is called before each iteration
-    Will stop iteration if returns True 
+    Thread-safe producer/consumer channel
+
+    Consumers block (without spinning) until an entry is added or the buffer is closed.
+    If maxsize is set, producers block while the buffer is full.
+
+    EXAMPLE:
+    ```
+    buff = SharedBuffer(maxsize=100)
+
+    def produce():
+        try:
+            for x in range(1000):
+                buff.add(x)
+        finally:
+            buff.close()
+
+    Thread(produce)
+
+    for x in buff: # stops once the buffer is closed & drained
+        ...
+
+    async for x in buff:
+        ...
+    ```
     """
 
-    def __init__(self) -> None:
-        
-        self.entries = []
+    def __init__(self,
+        maxsize: None | int = None
+    ) -> None:
 
-        self.__iadd__ = self.entries.append
+        self.maxsize = maxsize
 
-        self.add = self.entries.append
+        self.entries: deque[T] = deque()
 
-    def __iter__(self):
+        self._closed = False
+
+        lock = Lock()
+        self._not_empty = Condition(lock)
+        self._not_full = Condition(lock)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        """Stop accepting entries (consumers stop once the remaining entries are consumed)"""
+
+        with self._not_empty:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def add(self,
+        entry: T,
+        timeout: None | float = None
+    ) -> None:
+        """Add an entry (waits while the buffer is full)"""
+
+        with self._not_full:
+
+            if self.maxsize:
+                if not self._not_full.wait_for(
+                    lambda: self._closed or (len(self.entries) < self.maxsize),
+                    timeout
+                ):
+                    raise TimeoutError('SharedBuffer is full')
+
+            if self._closed:
+                raise BufferClosedError('SharedBuffer is closed')
+
+            self.entries.append(entry)
+            self._not_empty.notify()
+
+    put = add
+
+    def __iadd__(self, entry: T) -> 'SharedBuffer[T]':
+        self.add(entry)
         return self
 
-    def __next__(self):
+    def get(self,
+        timeout: None | float = None
+    ) -> T:
+        """
+        Remove and return the oldest entry (waits until one is added)
 
-        if self.stop_when():
+        Raises BufferClosedError if the buffer is closed & empty
+        """
 
-            raise StopIteration()
-        
-        else:
+        with self._not_empty:
 
-            while len(self.entries) == 0:
-                pass
+            if not self._not_empty.wait_for(
+                lambda: self._closed or self.entries,
+                timeout
+            ):
+                raise TimeoutError('SharedBuffer is empty')
 
-            entry = self.entries[0]
+            if not self.entries:
+                raise BufferClosedError('SharedBuffer is closed')
 
-            del self.entries[0]
+            entry = self.entries.popleft()
+            self._not_full.notify()
 
             return entry
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> T:
+        try:
+            return self.get()
+        except BufferClosedError:
+            raise StopIteration()
+
+    def __aiter__(self):
+        return self
+
+    def _ready(self, timeout: float) -> bool:
+        """Wait until an entry is added or the buffer is closed (without removing anything)"""
+
+        with self._not_empty:
+            return self._not_empty.wait_for(lambda: self._closed or self.entries, timeout)
+
+    async def __anext__(self) -> T:
+        from asyncio import to_thread
+
+        while True:
+
+            # Only waiting happens in the worker thread (for a bounded time),
+            # so a cancelled consumer never loses an entry or holds a thread for long
+            if self.entries or self._closed or await to_thread(self._ready, .5):
+
+                try:
+                    return self.get(0)
+
+                except TimeoutError:
+                    # Another consumer took it
+                    continue
+
+                except BufferClosedError:
+                    raise StopAsyncIteration()
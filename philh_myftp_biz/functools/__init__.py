@@ -1,12 +1,14 @@
 from typing import Any, Callable, Type
 
 from .Absorber import Absorber, NullSafe # pyright: ignore[reportUnusedImport]
-from .SharedBuffer import SharedBuffer # pyright: ignore[reportUnusedImport]
-from .attr import attr, dunders, LinkedProperty, attrs # pyright: ignore[reportUnusedImport]
+from .SharedBuffer import SharedBuffer, BufferClosedError # pyright: ignore[reportUnusedImport]
+from .attr import attr, dunders, LinkedProperty, attrs, class_info, is_private, ClassInfo # pyright: ignore[reportUnusedImport]
 from .Partial import Partial # pyright: ignore[reportUnusedImport]
 from .paths import cpath, spath # pyright: ignore[reportUnusedImport]
-from .cache import TransitoryCache, cached_property, clear_cache, diskcache # pyright: ignore[reportUnusedImport]
+from .cache import TransitoryCache, cached_property, clear_cache, diskcache, memoize, caches # pyright: ignore[reportUnusedImport]
 from .force_types import force_in_types, force_out_type # pyright: ignore[reportUnusedImport]
+from .wait import waitfor, Backoff # pyright: ignore[reportUnusedImport]
+from .retry import RetryPolicy, RetryBudget, CircuitBreaker, CircuitOpenError, circuit, budget # pyright: ignore[reportUnusedImport]
 from .supports import *
 
 def is_iterable(obj) -> bool:
@@ -38,13 +40,6 @@ def single_use(f): # pyright: ignore[reportMissingParameterType]
 
     return wrapper
 
-def waitfor(
-    func: Callable[..., bool]
-) -> None:
-
-    while not func():
-        pass
-
 def copy_attrs(
     src: Any, 
     dst: Any, 
@@ -76,15 +71,32 @@ class LockingClass:
 
 def retryfunc(
     tries: int = 3,
-    interval: int = 0,
-    exc: Exception = Exception
-):
-    from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
-
-    return retry(
-        stop = stop_after_attempt(tries),
-        wait = wait_fixed(interval),
-        retry = retry_if_exception_type(exc)
+    interval: float = 0,
+    exc: Type[Exception] | tuple[Type[Exception], ...] = Exception,
+    cap: float = 30,
+    retry_budget: None | RetryBudget = None,
+    breaker: None | CircuitBreaker = None
+) -> RetryPolicy:
+    """
+    Retry a function (see RetryPolicy)
+
+    interval: base delay between tries (randomized with decorrelated jitter)
+    retry_budget: limits retries across calls (see RetryBudget)
+
+    EXAMPLE:
+    ```
+    @retryfunc(tries=5, interval=1, exc=ConnectionError, breaker=circuit('api'))
+    def fetch(): ...
+    ```
+    """
+
+    return RetryPolicy(
+        tries = tries,
+        base = interval,
+        cap = cap,
+        exc = exc,
+        budget = retry_budget,
+        breaker = breaker
     )
 
 def stringify(obj:Any) -> str:
@@ -92,9 +104,21 @@ def stringify(obj:Any) -> str:
 
     string = f'--- {cpath(obj)} @{loc(obj)} ---\n'
 
-    for c in attrs(obj):
+    info = class_info(type(obj))
+    instance = getattr(obj, '__dict__', {})
+
+    for name in dir(obj):
+
+        # Skip private names & methods without reading them
+        if is_private(obj, name):
+            continue
+
+        if (name in info.callables) and (name not in instance):
+            continue
+
+        c = attr(obj, name)
 
-        if not (c.private or c.callable or c.null):
+        if not (c.callable or c.null):
 
             string += f'{c.name} = {c}\n'
 
@@ -1,6 +1,7 @@
 from functools import cached_property
 from dataclasses import dataclass
 from typing import Any, Generator
+from weakref import WeakKeyDictionary
 import builtins
 
 #========================================================
@@ -14,6 +15,78 @@ dunders = list(set(n for n in dunders if n.startswith('__')))
 
 #========================================================
 
+@dataclass(frozen=True)
+class ClassInfo:
+    """Attribute metadata of a class"""
+
+    names: frozenset[str]
+    """Names of all class attributes (dir)"""
+
+    prefixes: tuple[str, ...]
+    """Prefixes of names mangled by the class or its bases"""
+
+    properties: frozenset[str]
+    """property & cached_property attributes"""
+
+    callables: frozenset[str]
+    """Methods, functions & nested classes"""
+
+_class_info: 'WeakKeyDictionary[type, ClassInfo]' = WeakKeyDictionary()
+
+def class_info(cls: type) -> ClassInfo:
+    """Get the attribute metadata of a class (cached per class)"""
+    from inspect import getattr_static, isfunction
+    from types import BuiltinFunctionType, MethodDescriptorType, WrapperDescriptorType, ClassMethodDescriptorType
+
+    info = _class_info.get(cls)
+
+    if info is not None:
+        return info
+
+    names = dir(cls)
+
+    properties = set()
+    callables = set()
+
+    for name in names:
+
+        try:
+            value = getattr_static(cls, name)
+        except AttributeError:
+            continue
+
+        if isinstance(value, (property, cached_property)):
+            properties.add(name)
+
+        elif isfunction(value) or isinstance(value, (
+            type, staticmethod, classmethod,
+            BuiltinFunctionType, MethodDescriptorType, WrapperDescriptorType, ClassMethodDescriptorType
+        )):
+            callables.add(name)
+
+    info = _class_info[cls] = ClassInfo(
+        names = frozenset(names),
+        prefixes = tuple(f'_{c.__name__}__' for c in cls.__mro__),
+        properties = frozenset(properties),
+        callables = frozenset(callables)
+    )
+
+    return info
+
+def is_private(obj:Any, name:str) -> bool:
+    """Check if an attribute of an instance or object is a dunder or name-mangled"""
+
+    if name.startswith('__') or name.startswith(class_info(type(obj)).prefixes):
+        return True
+
+    elif hasattr(obj, '__name__') and name.startswith(f'_{obj.__name__}__'):
+        return True
+
+    else:
+        return False
+
+#========================================================
+
 @dataclass
 class attr:
     """Attribute of Instance/Object"""
@@ -22,26 +95,16 @@ class attr:
     name: str
 
     @cached_property
-    def private(self) -> bool:
-
-        if self.name.startswith('__'):
-            return True
+    def _info(self) -> ClassInfo:
+        return class_info(type(self.parent))
 
-        elif hasattr(self.parent, '__name__') and (self.name.startswith(f'_{self.parent.__name__}__')):
-            return True
-
-        elif (self.name.startswith(f'_{self.parent.__class__.__name__}__')):
-            return True
-
-        else:
-            
-            for base in self.parent.__class__.__bases__:
+    @cached_property
+    def private(self) -> bool:
+        return is_private(self.parent, self.name)
 
-                if self.name.startswith(f'_{base.__name__}__'):
-                
-                    return True
-                
-        return False
+    @cached_property
+    def property(self) -> bool:
+        return (self.name in self._info.properties)
 
     @cached_property
     def value(self):
@@ -54,8 +117,17 @@ class attr:
                 pass
 
     @cached_property
-    def callable(self):
-        return callable(self.value)
+    def callable(self) -> bool:
+
+        if self.private:
+            return False
+
+        # Methods of the class (unless shadowed by the instance)
+        elif (self.name in self._info.callables) and (self.name not in getattr(self.parent, '__dict__', {})):
+            return True
+
+        else:
+            return callable(self.value)
     
     @cached_property
     def parameters(self) -> list[str]:
@@ -1,31 +1,221 @@
 from functools import cached_property as _cached_property
-from typing import Any
+from typing import Callable, Iterable, Literal, Any
 
 from .transitory import TransitoryCache # pyright: ignore[reportUnusedImport]
 from .prop import cached_property # pyright: ignore[reportUnusedImport]
+from .memo import memoize # pyright: ignore[reportUnusedImport]
+from .flight import SingleFlight, FileFlight # pyright: ignore[reportUnusedImport]
+from .stats import caches # pyright: ignore[reportUnusedImport]
 
 def clear_cache(instance: Any) -> None:
+    """Clear every cached property of an instance"""
 
-    for name, value in vars(instance).items():
+    for cls in type(instance).__mro__:
 
-        if isinstance(value, _cached_property):
+        for name, value in vars(cls).items():
 
-            delattr(instance, name)
+            if isinstance(value, cached_property):
+                value.__delete__(instance)
+
+            elif isinstance(value, _cached_property):
+                instance.__dict__.pop(name, None)
 
 # ======================================
 
+evictions = Literal['lrs', 'lru', 'lfu', 'none']
+
+_eviction_policies: dict[evictions, str] = {
+    'lrs': 'least-recently-stored',
+    'lru': 'least-recently-used',
+    'lfu': 'least-frequently-used',
+    'none': 'none'
+}
+
+class _namespace:
+    """A diskcache store with its flight & stats"""
+
+    def __init__(self,
+        name: None | str,
+        size_limit: None | int,
+        eviction: None | evictions,
+        shards: None | int
+    ) -> None:
+        from diskcache import Cache, FanoutCache
+        from hashlib import md5
+        from ...pc import loc
+
+        settings = {}
+
+        if size_limit is not None:
+            settings['size_limit'] = size_limit
+
+        if eviction is not None:
+            settings['eviction_policy'] = _eviction_policies[eviction]
+
+        if name is None:
+            # Private to the script
+            dir = loc.cache
+            label = 'diskcache'
+        else:
+            # Shared by every script on this machine
+            dir = loc.temp.child(f'diskcache/{name}/')
+            label = f'diskcache:{name}'
+
+        dir.mkdir()
+
+        self.shards = shards
+
+        if shards:
+            self.cache: Cache | FanoutCache = FanoutCache(dir.path, shards=shards, **settings)
+        else:
+            self.cache = Cache(dir.path, **settings)
+
+        # Named after the store, so only its users share the flight
+        self.flight = FileFlight('diskcache-' + md5(dir.path.encode()).hexdigest())
+
+        self.stats = caches(label, lambda: {
+            'size': len(self.cache),
+            'nbytes': self.cache.volume()
+        })
+
 class _diskcache:
+    """
+    Memoize functions to disk
+
+    Without a namespace, results are stored in `__pycache__` next to the main script.
+    Named namespaces are stored in the temp dir, so services on the same machine share them.
+
+    Settings (size_limit, eviction) are persisted in the store, the first caller to set them wins.
+    Every user of a namespace must use the same # of shards.
+
+    EXAMPLE:
+    ```
+    diskcache.namespace('tmdb', size_limit=2**30, eviction='lfu', shards=8)
+
+    @diskcache(expire=3600, namespace='tmdb')
+    def lookup(title: str) -> dict:
+        ...
+
+    diskcache.warm(lookup, ['Alien', 'Heat', ('Dune', 2021)])
+    ```
+    """
+
+    def __init__(self) -> None:
+        from threading import Lock
+
+        self._namespaces: dict[None | str, _namespace] = {}
+        self._lock = Lock()
+
+    def namespace(self,
+        name: None | str = None,
+        size_limit: None | int = None,
+        eviction: None | evictions = None,
+        shards: None | int = None
+    ) -> '_namespace':
+        """
+        Get (or configure) a namespace
+
+        size_limit: max bytes on disk (default 1GB)
+        eviction: lrs (least-recently-stored), lru, lfu or none
+        shards: split the store into shards (FanoutCache), so concurrent writers don't block each other
+        """
+
+        with self._lock:
+
+            ns = self._namespaces.get(name)
+
+            if ns is None:
+                ns = self._namespaces[name] = _namespace(name, size_limit, eviction, shards)
+
+            else:
+
+                if (shards is not None) and (shards != ns.shards):
+                    raise ValueError(f'diskcache namespace {name!r} is already open with shards={ns.shards}')
+
+                if size_limit is not None:
+                    ns.cache.reset('size_limit', size_limit)
+
+                if eviction is not None:
+                    ns.cache.reset('eviction_policy', _eviction_policies[eviction])
+
+        return ns
 
     def __call__(self, 
-        expire: int|None = None
+        expire: int|None = None,
+        namespace: None | str = None
     ):
-        from diskcache import Cache
-        from ...pc import loc
+        """
+        Memoize a function to disk
+
+        Concurrent misses for the same key (across threads & processes) only call the function once
+        """
+        from functools import wraps
+        from time import perf_counter
+        from .flight import missing
+
+        def decorator(func):
+
+            ns = self.namespace(namespace)
+
+            cached = ns.cache.memoize(expire=expire)(func)
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+
+                start = perf_counter()
+
+                key = cached.__cache_key__(*args, **kwargs)
+
+                value = ns.cache.get(key, missing)
+
+                if value is not missing:
+                    ns.stats.hit(perf_counter() - start)
+                    return value
+
+                value = ns.flight(
+                    key,
+                    lambda: cached(*args, **kwargs),
+                    lookup = lambda: ns.cache.get(key, missing)
+                )
+
+                ns.stats.miss(perf_counter() - start)
+
+                return value
+
+            wrapper.__cache_key__ = cached.__cache_key__
+
+            return wrapper
+
+        return decorator
+
+    def warm(self,
+        func: Callable,
+        keys: Iterable[Any],
+        workers: int = 8
+    ) -> int:
+        """
+        Call a diskcache'd function for every key in parallel, to fill the cache
+
+        A key is passed as the args if it is a tuple, otherwise as the only arg
+
+        Returns the # of keys which failed
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from ...terminal import Log
 
-        if not hasattr(self, 'cache'):
-            self.cache = Cache(loc.cache.path)
+        def call(key) -> bool:
+            try:
+                if isinstance(key, tuple):
+                    func(*key)
+                else:
+                    func(key)
+                return True
+            except Exception:
+                Log.WARN(f'Failed to warm {key!r}', exc_info=True)
+                return False
 
-        return self.cache.memoize(expire=expire)
+        with ThreadPoolExecutor(workers) as pool:
+            return list(pool.map(call, keys)).count(False)
 
 diskcache = _diskcache()
 
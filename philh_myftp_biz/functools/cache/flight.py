@@ -0,0 +1,218 @@
+from typing import Callable, Hashable, Any, TYPE_CHECKING
+from concurrent.futures import Future
+from functools import cached_property
+from threading import Lock
+
+if TYPE_CHECKING:
+    from asyncio import Task
+    from ...file import Lock as FileLock
+    from ...pc import Path
+
+missing = object()
+"""Returned by a lookup when the key is not cached"""
+
+class SingleFlight:
+    """
+    Concurrent callers for the same key wait for the first caller's result
+
+    EXAMPLE:
+    ```
+    flight = SingleFlight()
+
+    # Only one thread requests the page, the others share the response
+    flight(url, requests.get, url)
+    ```
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self._tasks: dict[Hashable, 'Task'] = {}
+
+    def __contains__(self, key:Hashable) -> bool:
+        """Check if a call for the key is in flight"""
+        return (key in self._calls) or (key in self._tasks)
+
+    def __call__[R](self,
+        key: Hashable,
+        func: Callable[..., R],
+        *args,
+        **kwargs
+    ) -> R:
+
+        with self._lock:
+
+            future = self._calls.get(key)
+
+            leader = (future is None)
+
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+            future.set_result(result)
+            return result
+
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def acall[R](self,
+        key: Hashable,
+        func: Callable[..., Any],
+        *args,
+        **kwargs
+    ) -> R:
+        """Single-flight for coroutine functions (within one event loop)"""
+        from asyncio import ensure_future, shield
+
+        task = self._tasks.get(key)
+
+        if task is None:
+
+            task = self._tasks[key] = ensure_future(func(*args, **kwargs))
+
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+
+        # A cancelled waiter must not cancel the shared call
+        return await shield(task)
+
+class FileFlight:
+    """
+    Single-flight across processes which share a cache (diskcache, sqlite, ...)
+
+    Callers in this process are deduplicated with SingleFlight.
+    Across processes, the first caller of a key claims an in-flight marker file for it,
+    and the others wait for the marker to go away, then re-check the shared cache (lookup).
+
+    Striped lock files only guard claiming / checking markers (never the call itself),
+    so unrelated keys never wait on each other.
+    """
+
+    def __init__(self,
+        name: str,
+        stripes: int = 64
+    ) -> None:
+
+        self.name = name
+        self.stripes = stripes
+
+        self._threads = SingleFlight()
+
+    @cached_property
+    def _dir(self) -> 'Path':
+        from ...pc import loc
+
+        dir = loc.temp.child(f'FileFlight-{self.name}/')
+        dir.mkdir()
+
+        return dir
+
+    @cached_property
+    def _locks(self) -> list['FileLock']:
+        from ...file import Lock
+
+        return [Lock(self._dir.child(f'{x}.lock').path) for x in range(self.stripes)]
+
+    @staticmethod
+    def _digest(key:Hashable) -> bytes:
+        from hashlib import md5
+
+        # hash() of a str is randomized per process
+        return md5(repr(key).encode()).digest()
+
+    def _stripe(self, key:Hashable) -> 'FileLock':
+        return self._locks[int.from_bytes(self._digest(key)[:4]) % self.stripes]
+
+    def _marker(self, key:Hashable) -> str:
+        return self._dir.child(f'{self._digest(key).hex()}.flight').path
+
+    @staticmethod
+    def _claim(marker:str) -> bool:
+        """Create the in-flight marker of a key (replacing one left by a dead process)"""
+        from os import open as os_open, close, write, remove, getpid, O_CREAT, O_EXCL, O_WRONLY
+        from psutil import pid_exists
+
+        while True:
+
+            try:
+                fd = os_open(marker, O_CREAT | O_EXCL | O_WRONLY)
+
+            except FileExistsError:
+
+                try:
+                    with open(marker) as f:
+                        owner = int(f.read() or 0)
+                except (FileNotFoundError, ValueError):
+                    owner = 0
+
+                if owner and pid_exists(owner):
+                    return False
+
+                try:
+                    remove(marker)
+                except FileNotFoundError:
+                    pass
+
+                continue
+
+            write(fd, str(getpid()).encode())
+            close(fd)
+
+            return True
+
+    def __call__[R](self,
+        key: Hashable,
+        func: Callable[..., R],
+        *args,
+        lookup: None | Callable[[], Any] = None,
+        **kwargs
+    ) -> R:
+        """
+        lookup: returns the cached value, or `missing`
+        (if None, func is expected to hit the shared cache itself)
+        """
+
+        if lookup:
+            value = lookup()
+            if value is not missing:
+                return value
+
+        return self._threads(key, self._locked, key, func, lookup, args, kwargs)
+
+    def _locked(self, key, func, lookup, args, kwargs):
+        from os import remove
+        from ..wait import Backoff
+
+        marker = self._marker(key)
+
+        delays = Backoff(.01, .5)
+
+        while True:
+
+            with self._stripe(key)():
+
+                if lookup:
+                    value = lookup()
+                    if value is not missing:
+                        return value
+
+                if self._claim(marker):
+                    break
+
+            # Another process is calling func for this key
+            delays.sleep()
+
+        try:
+            return func(*args, **kwargs)
+
+        finally:
+            remove(marker)
@@ -0,0 +1,127 @@
+from typing import Callable, Any
+from collections import OrderedDict
+from threading import RLock
+from sys import getsizeof
+
+class LRU[K, V]:
+    """
+    Thread-safe in-memory LRU store with per-entry expiry
+
+    Evicts the least recently used entries when maxsize or max_bytes is exceeded
+    """
+
+    def __init__(self,
+        maxsize: None | int = 128,
+        max_bytes: None | int = None,
+        sizeof: Callable[[Any], int] = getsizeof
+    ) -> None:
+
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+
+        self.lock = RLock()
+
+        # key -> (expires, size, value)
+        self._data: OrderedDict[K, tuple[None|float, int, V]] = OrderedDict()
+
+        self.nbytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: K, default: Any = None) -> V | Any:
+        from time import monotonic
+
+        with self.lock:
+
+            entry = self._data.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires, _, value = entry
+
+            if (expires is not None) and (expires <= monotonic()):
+                self.pop(key)
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self,
+        key: K,
+        value: V,
+        ttl: None | float = None
+    ) -> None:
+        from time import monotonic
+
+        if ttl is None:
+            expires = None
+        else:
+            expires = monotonic() + ttl
+
+        size = self.sizeof(value) if self.max_bytes else 0
+
+        with self.lock:
+
+            self.pop(key)
+
+            self._data[key] = (expires, size, value)
+            self.nbytes += size
+
+            self._evict()
+
+    def pop(self, key: K) -> None:
+
+        with self.lock:
+
+            entry = self._data.pop(key, None)
+
+            if entry:
+                self.nbytes -= entry[1]
+
+    def _evict(self) -> None:
+
+        while len(self._data) > 0:
+
+            if self.maxsize is not None and len(self._data) > self.maxsize:
+                pass
+            elif self.max_bytes is not None and self.nbytes > self.max_bytes:
+                pass
+            else:
+                break
+
+            _, (_, size, _) = self._data.popitem(last=False)
+
+            self.nbytes -= size
+            self.evictions += 1
+
+    def expire(self) -> None:
+        """Remove all expired entries"""
+        from time import monotonic
+
+        now = monotonic()
+
+        with self.lock:
+            for key, (expires, _, _) in list(self._data.items()):
+                if (expires is not None) and (expires <= now):
+                    self.pop(key)
+
+    def clear(self) -> None:
+        with self.lock:
+            self._data.clear()
+            self.nbytes = 0
+
+    def __contains__(self, key: K) -> bool:
+        from time import monotonic
+
+        entry = self._data.get(key)
+
+        return (entry is not None) and ((entry[0] is None) or (entry[0] > monotonic()))
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,168 @@
+from typing import Callable, Any, NamedTuple, Hashable
+from .flight import SingleFlight
+from .stats import caches
+from .lru import LRU
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    nbytes: int
+
+def _key(*args, **kwargs) -> Hashable:
+    if kwargs:
+        return (args, tuple(sorted(kwargs.items())))
+    else:
+        return args
+
+_missing = object()
+
+def memoize(
+    ttl: None | float = None,
+    maxsize: None | int = 128,
+    max_bytes: None | int = None,
+    key: Callable[..., Hashable] = _key,
+    stale: None | float = None
+):
+    """
+    Thread-safe in-memory memoization (sync & async functions)
+
+    ttl: seconds until a result expires
+    maxsize: max # of results
+    max_bytes: max total size of results (via sys.getsizeof)
+    key: builds the cache key from the call arguments
+    stale: seconds an expired result is still served while it is refreshed in the background
+
+    Concurrent misses for the same key only call the function once (SingleFlight)
+
+    Stats are reported to `caches` as 'memoize:<module>.<function>'
+
+    Stack on top of diskcache for a two-tier cache,
+    hot keys are then served from memory without touching sqlite
+
+    EXAMPLE:
+    ```
+    @memoize(ttl=60, maxsize=512)
+    @diskcache(expire=3600)
+    def lookup(title: str) -> dict:
+        ...
+
+    lookup.cache_info() -> CacheInfo(hits=..., misses=..., ...)
+    ```
+    """
+    from inspect import iscoroutinefunction
+    from functools import wraps
+    from time import perf_counter
+    from sys import getsizeof
+    from ..paths import cpath
+
+    if ttl is None:
+        life = None
+    else:
+        life = ttl + (stale or 0)
+
+    def fresh_until() -> None | float:
+        from time import monotonic
+
+        if ttl is not None:
+            return monotonic() + ttl
+
+    def is_stale(until: None | float) -> bool:
+        from time import monotonic
+
+        return (until is not None) and (until <= monotonic())
+
+    def decorator(func):
+
+        # key -> (fresh_until, value)
+        store = LRU(maxsize, max_bytes, lambda e: getsizeof(e[1]))
+
+        flight = SingleFlight()
+
+        stats = caches(
+            name = f'memoize:{cpath(func)}',
+            probe = lambda: {
+                'evictions': store.evictions,
+                'size': len(store),
+                'nbytes': store.nbytes
+            }
+        )
+
+        if iscoroutinefunction(func):
+
+            async def compute(k, args, kwargs):
+                value = await func(*args, **kwargs)
+                store.set(k, (fresh_until(), value), life)
+                return value
+
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+
+                start = perf_counter()
+
+                k = key(*args, **kwargs)
+
+                entry = store.get(k, _missing)
+
+                if entry is _missing:
+                    value = await flight.acall(k, compute, k, args, kwargs)
+                    stats.miss(perf_counter() - start)
+                    return value
+
+                stats.hit(perf_counter() - start)
+
+                until, value = entry
+
+                # Serve the stale value and refresh in the background
+                if is_stale(until) and (k not in flight):
+                    from asyncio import ensure_future
+                    ensure_future(flight.acall(k, compute, k, args, kwargs))
+
+                return value
+
+        else:
+
+            def compute(k, args, kwargs):
+                value = func(*args, **kwargs)
+                store.set(k, (fresh_until(), value), life)
+                return value
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+
+                start = perf_counter()
+
+                k = key(*args, **kwargs)
+
+                entry = store.get(k, _missing)
+
+                if entry is _missing:
+                    value = flight(k, compute, k, args, kwargs)
+                    stats.miss(perf_counter() - start)
+                    return value
+
+                stats.hit(perf_counter() - start)
+
+                until, value = entry
+
+                # Serve the stale value and refresh in the background
+                if is_stale(until) and (k not in flight):
+                    from ...process.Thread import Thread
+                    Thread(flight, k, compute, k, args, kwargs)
+
+                return value
+
+        wrapper.cache_info = lambda: CacheInfo(
+            hits = store.hits,
+            misses = store.misses,
+            evictions = store.evictions,
+            size = len(store),
+            nbytes = store.nbytes
+        )
+
+        wrapper.cache_clear = store.clear
+
+        return wrapper
+
+    return decorator
@@ -1,23 +1,138 @@
 from functools import cached_property as _cached_property
+from typing import Callable, Iterable, Any
+from threading import Lock, RLock
+
+_missing = object()
 
 class cached_property[T](_cached_property[T]):
+    """
+    Thread-safe cached property
+
+    The getter runs once per instance, even when several threads read it at once.
+    Once cached, a read is a lock-free dict lookup.
+
+    ttl: seconds until the cached value expires
+    invalidates: names of cached properties which are cleared when this one is computed, set or deleted
+
+    EXAMPLE:
+    ```
+    @cached_property
+    def files(self): ...
+
+    @cached_property(ttl=60, invalidates=['files'])
+    def raw(self): ...
+    ```
+    """
+
+    def __init__(self,
+        func: None | Callable[[Any], T] | T = None,
+        ttl: None | float = None,
+        invalidates: Iterable[str] = (),
+        fset: None | Callable[[Any, T], None] = None
+    ) -> None:
+
+        self.ttl = ttl
+        self.invalidates = tuple(invalidates)
+        self.fset = fset
+
+        self.attrname = None
+
+        # id(instance) -> lock, while the getter of the instance is running
+        self._locks: dict[int, RLock] = {}
+        self._guard = Lock()
+
+        if func is not None:
+            self(func)
 
-    def __init__(self, func):
+    def __call__(self, func: Callable[[Any], T] | T) -> 'cached_property[T]':
+        """Set the getter (when used as `@cached_property(...)`)"""
 
         if not callable(func):
-            func = lambda s: func
+            value = func
+            func = lambda _: value
+
+        self.func = func
+        self.__doc__ = func.__doc__
+        self.__module__ = func.__module__
+
+        return self
+
+    def __set_name__(self, owner, name: str) -> None:
+        super().__set_name__(owner, name)
+        self._expires = f'_{name}_expires'
+
+    def __get__(self, inst, owner=None) -> T:
+        from time import monotonic
+
+        if inst is None:
+            return self
+
+        cache = inst.__dict__
+        value = cache.get(self.attrname, _missing)
+
+        # Fast path
+        if (value is not _missing) and ((self.ttl is None) or (cache[self._expires] > monotonic())):
+            return value
+
+        with self._guard:
+            lock = self._locks.setdefault(id(inst), RLock())
+
+        with lock:
 
-        super().__init__(func)
+            try:
 
-    def __new__(cls, *_, **__) -> _cached_property:
-        return super().__new__(cls)
+                # Another thread may have computed it while this one waited
+                value = cache.get(self.attrname, _missing)
 
-    def __set__(self, inst, value) -> None:
-        inst.__dict__[self.attrname] = value
+                if (value is _missing) or ((self.ttl is not None) and (cache[self._expires] <= monotonic())):
+
+                    value = self.func(inst)
+
+                    self._store(inst, value)
+
+            finally:
+                # Even if func raised (ids are reused by later objects)
+                with self._guard:
+                    self._locks.pop(id(inst), None)
+
+        return value
+
+    def _store(self, inst, value: T) -> None:
+        from time import monotonic
+
+        cache = inst.__dict__
+
+        self._invalidate(inst)
+
+        if self.ttl is not None:
+            cache[self._expires] = monotonic() + self.ttl
+
+        cache[self.attrname] = value
+
+    def _invalidate(self, inst) -> None:
+
+        for name in self.invalidates:
+
+            prop = getattr(type(inst), name, None)
+
+            if isinstance(prop, cached_property):
+                inst.__dict__.pop(prop._expires, None)
+
+            inst.__dict__.pop(name, None)
+
+    def __set__(self, inst, value: T) -> None:
+
+        if self.fset:
+            self.fset(inst, value)
+
+        self._store(inst, value)
 
     def __delete__(self, inst) -> None:
+
+        self._invalidate(inst)
+
         inst.__dict__.pop(self.attrname, None)
-    
-    def setter(self, fset):
-        return type(self)(self.func, fset=fset)
+        inst.__dict__.pop(self._expires, None)
 
+    def setter(self, fset: Callable[[Any, T], None]) -> 'cached_property[T]':
+        return type(self)(self.func, self.ttl, self.invalidates, fset)
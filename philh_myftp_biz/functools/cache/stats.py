@@ -0,0 +1,202 @@
+from typing import Callable, Any, TYPE_CHECKING
+from dataclasses import dataclass, field
+from bisect import bisect_left
+from threading import Lock
+
+if TYPE_CHECKING:
+    from ...pc import Path
+
+_bounds: list[float] = [1e-6 * (2 ** x) for x in range(32)]
+"""Histogram bucket upper bounds (1µs, 2µs, 4µs, ... ~36min)"""
+
+class Histogram:
+    """Latency histogram with exponential buckets"""
+
+    def __init__(self) -> None:
+        self.counts: list[int] = [0] * (len(_bounds) + 1)
+        self.total: int = 0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect_left(_bounds, seconds)] += 1
+        self.total += 1
+
+    def percentile(self, p: float) -> None | float:
+        """Upper bound (seconds) of the bucket containing the p-th percentile"""
+
+        if self.total == 0:
+            return None
+
+        rank = p / 100 * self.total
+        seen = 0
+
+        for x, count in enumerate(self.counts):
+
+            seen += count
+
+            if seen >= rank:
+                return _bounds[min(x, len(_bounds) - 1)]
+
+    def dict(self) -> dict[str, Any]:
+        return {
+            'count': self.total,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'buckets': {f'{b:g}': c for b, c in zip(_bounds, self.counts) if c}
+        }
+
+@dataclass
+class CacheStats:
+    """Counters for a single cache"""
+
+    name: str
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    nbytes: int = 0
+
+    hit_latency: Histogram = field(default_factory=Histogram)
+    miss_latency: Histogram = field(default_factory=Histogram)
+
+    probe: Callable[[], dict[str, int]] = lambda: {}
+    """Returns current gauges (evictions, size, nbytes) of the cache"""
+
+    def __post_init__(self) -> None:
+        self._lock = Lock()
+
+    def hit(self, seconds: float) -> None:
+        with self._lock:
+            self.hits += 1
+            self.hit_latency.record(seconds)
+
+    def miss(self, seconds: float) -> None:
+        with self._lock:
+            self.misses += 1
+            self.miss_latency.record(seconds)
+
+    @property
+    def hit_rate(self) -> None | float:
+        total = self.hits + self.misses
+        if total > 0:
+            return self.hits / total
+
+    def refresh(self) -> None:
+        """Update the gauges from the cache"""
+        from ...terminal import Log
+
+        try:
+            for name, value in self.probe().items():
+                setattr(self, name, value)
+        except Exception:
+            Log.VERB(exc_info=True)
+
+    def dict(self) -> dict[str, Any]:
+
+        self.refresh()
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'evictions': self.evictions,
+            'size': self.size,
+            'nbytes': self.nbytes,
+            'hit_latency': self.hit_latency.dict(),
+            'miss_latency': self.miss_latency.dict()
+        }
+
+class _caches:
+    """
+    Registry of cache statistics
+
+    EXAMPLE:
+    ```
+    stats = caches('my-cache')
+    stats.hit(seconds)
+
+    Log.INFO(caches.summary())
+    caches.dump(Path('stats.json'))
+    caches.report_at_exit()
+    ```
+    """
+
+    def __init__(self) -> None:
+        self.stats: dict[str, CacheStats] = {}
+        self._lock = Lock()
+
+    def __call__(self,
+        name: str,
+        probe: None | Callable[[], dict[str, int]] = None
+    ) -> CacheStats:
+        """Get (or register) the stats of a cache"""
+
+        with self._lock:
+
+            if name not in self.stats:
+                self.stats[name] = CacheStats(name)
+
+            stats = self.stats[name]
+
+        if probe:
+            stats.probe = probe
+
+        return stats
+
+    def summary(self) -> str:
+        """Log-friendly table of all caches"""
+        from ...db import Size
+
+        def ms(seconds: None | float) -> str:
+            if seconds is None:
+                return '-'
+            return f'{seconds*1000:.3g}ms'
+
+        lines = ['Cache Statistics:']
+
+        for name, stats in sorted(self.stats.items()):
+
+            stats.refresh()
+
+            rate = stats.hit_rate
+
+            lines += [
+                f'{name} | ' + \
+                f'hits={stats.hits} misses={stats.misses} ' + \
+                f'rate={'-' if rate is None else f'{rate:.1%}'} | ' + \
+                f'evictions={stats.evictions} size={stats.size} ' + \
+                f'bytes={Size.from_bytes(stats.nbytes, ndigits=2)} | ' + \
+                f'hit p50/p95={ms(stats.hit_latency.percentile(50))}/{ms(stats.hit_latency.percentile(95))} ' + \
+                f'miss p50/p95={ms(stats.miss_latency.percentile(50))}/{ms(stats.miss_latency.percentile(95))}'
+            ]
+
+        return '\n'.join(lines)
+
+    def dump(self,
+        path: 'None | Path' = None
+    ) -> dict[str, dict[str, Any]]:
+        """Get all stats as json (and save them to path)"""
+
+        data = {name: stats.dict() for name, stats in self.stats.items()}
+
+        if path:
+            path.JSON.save(data)
+
+        return data
+
+    def report_at_exit(self,
+        path: 'None | Path' = None
+    ) -> None:
+        """Log the summary (and dump the stats to path) when the program exits"""
+        from atexit import register
+        from ...terminal import Log
+
+        def report() -> None:
+            Log.INFO(self.summary())
+            if path:
+                self.dump(path)
+
+        register(report)
+
+caches = _caches()
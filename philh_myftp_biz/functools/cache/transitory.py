@@ -1,73 +1,184 @@
 from ..supports import SupportsStr, SupportsJSON
-from typing import TYPE_CHECKING, TypedDict
-from ...json.Dict import Dict
+from typing import TYPE_CHECKING, Callable, Any
+from functools import cached_property
+from .flight import FileFlight, missing
+from .stats import caches
+from .lru import LRU
 
 if TYPE_CHECKING:
-    from ...time import Timeout
+    from diskcache import Cache
+
+class TransitoryCache[T]:
+    """
+    Persistent key/value cache where every key expires
+
+    Backed by an indexed sqlite store (diskcache), so lookups cost O(1) I/O.
+    Hot keys are also kept in an in-memory LRU for up to `memory_ttl` seconds.
+    """
+
+    def __init__(self,
+        id: SupportsStr = 0,
+        expire: int = 18_000,
+        size_limit: int = 2**28, # 256 MB
+        maxsize: int = 256,
+        memory_ttl: int = 60,
+        sweep: int = 600
+    ) -> None:
 
-class CachedItem[T](TypedDict):
-    time: 'Timeout'
-    value: T
+        self.id = id
 
-class TransitoryCache[T](Dict[CachedItem[T]]):
+        self.expire = expire
+        """Seconds until a key expires (wall-clock)"""
 
-    def __init__(self, 
-        id: SupportsStr = 0, 
-        expire: int = 18_000
-    ) -> None:
+        self.size_limit = size_limit
+        """Max bytes on disk (oldest keys are evicted first)"""
+
+        self.memory_ttl = memory_ttl
+        """Max seconds a value is served from memory (bounds staleness across processes)"""
+
+        self.sweep = sweep
+        """Seconds between sweeps of expired keys"""
+
+        self._memory: LRU[str, T] = LRU(maxsize)
+        self._swept: float = 0
+
+        self.stats = caches(f'TransitoryCache:{id}', self._probe)
+
+    def _probe(self) -> dict[str, int]:
+
+        # Don't open the store just to report on it
+        if '_disk' not in self.__dict__:
+            return {}
+
+        return {
+            'size': len(self._disk),
+            'nbytes': self._disk.volume()
+        }
+
+    @cached_property
+    def _disk(self) -> 'Cache':
+        from diskcache import Cache
         from ...pc import loc
 
-        self.expire = expire
+        return Cache(
+            directory = loc.temp.child(f'TransitoryCache-{self.id}').path,
+            size_limit = self.size_limit,
+            eviction_policy = 'least-recently-stored'
+        )
+
+    @cached_property
+    def _flight(self) -> FileFlight:
+        return FileFlight(f'TransitoryCache-{self.id}')
+
+    def _sweep(self) -> None:
+        """Periodically remove expired keys from disk"""
+        from time import monotonic
+
+        if (monotonic() - self._swept) > self.sweep:
+            self._swept = monotonic()
+            self._disk.expire()
+
+    def _get(self, _key:str) -> T | Any:
+        """Get a value by its dumped key (or `missing`)"""
+        from time import time, perf_counter
+
+        start = perf_counter()
 
-        file = loc.temp.child(f'TransitoryCache-{id}.pkl')
-        self.clear = file.delete
+        value = self._memory.get(_key, missing)
 
-        super().__init__(file.PKL)
+        if value is not missing:
+            self.stats.hit(perf_counter() - start)
+            return value
+
+        value, expires = self._disk.get(_key, missing, expire_time=True)
+
+        if value is missing:
+            self.stats.miss(perf_counter() - start)
+            return missing
+
+        self.stats.hit(perf_counter() - start)
+
+        self._memory.set(
+            key = _key,
+            value = value,
+            ttl = min(self.memory_ttl, expires - time())
+        )
 
-    def _repair(self) -> None:
-        from _pickle import UnpicklingError
-        
-        try:
-            self.read()
-        except (EOFError, UnpicklingError):
-            self.save({})
+        return value
 
     def __getitem__(self, key:SupportsJSON) -> T | None:
         from ...json import dumps
 
-        _key = dumps(key)
+        value = self._get(dumps(key))
+
+        if value is missing:
+            return None
+        else:
+            return value
 
-        self._repair()
+    def fetch(self, key:SupportsJSON, func:Callable[[], T]) -> T:
+        """
+        Get a key, or call func and store the result if it is missing
 
-        item = super().__getitem__(_key)
-         
-        if item is None:
-            pass
+        Concurrent misses (across threads & processes) only call func once
+        """
+        from ...json import dumps
 
-        elif item['time'].timed_out:
-            super().__delitem__(_key)
+        _key = dumps(key)
+
+        def compute() -> T:
+            value = func()
+            self[key] = value
+            return value
+
+        return self._flight(
+            _key,
+            compute,
+            lookup = lambda: self._get(_key)
+        )
 
-        else:
-            return item['value'] # pyright: ignore[reportReturnType]
-            
     def __setitem__(self, key:SupportsJSON, value:T) -> None:
-        from ...time import Timeout
         from ...json import dumps
 
-        self._repair()
+        _key = dumps(key)
+
+        self._disk.set(_key, value, expire=self.expire)
 
-        super().__setitem__(
-            key = dumps(key), 
-            value = {
-                'time': Timeout(self.expire),
-                'value': value
-            }
+        self._memory.set(
+            key = _key,
+            value = value,
+            ttl = min(self.memory_ttl, self.expire)
         )
 
+        self._sweep()
+
+    def __delitem__(self, key:SupportsJSON) -> None:
+        from ...json import dumps
+
+        _key = dumps(key)
+
+        self._memory.pop(_key)
+        self._disk.delete(_key)
+
     def __contains__(self, key:SupportsJSON) -> bool:
         from ...json import dumps
 
-        self._repair()
+        _key = dumps(key)
+
+        return (_key in self._memory) or (_key in self._disk)
+
+    def get(self, key:SupportsJSON, default:T = None) -> T | None:
+
+        value = self[key]
+
+        if value is None:
+            return default
+        else:
+            return value
 
-        return super().__contains__(dumps(key))
+    def clear(self) -> None:
+        self._memory.clear()
+        self._disk.clear()
 
+    def __len__(self) -> int:
+        return len(self._disk)
@@ -1,42 +1,214 @@
-from inspect import signature
+from typing import Callable, Any
 from functools import wraps
 
+type Converter = Callable[[Any], Any]
+
+def _hints(func) -> dict[str, Any]:
+    """Annotations of a function (names which can't be resolved are left as forward refs)"""
+    from inspect import get_annotations
+
+    try:
+        return get_annotations(func, eval_str=True)
+    except NameError:
+        pass
+
+    try:
+        from annotationlib import get_annotations, Format # pyright: ignore
+        return get_annotations(func, format=Format.FORWARDREF)
+    except ImportError:
+        return {}
+
+def _converter(etype) -> None | Converter:
+    """
+    Build a function which coerces a value to a type annotation
+
+    Returns None if the annotation can't be coerced to (Any, Literal, forward refs, ...)
+    """
+    from typing import get_origin, get_args, Annotated, Union
+    from inspect import isclass, isabstract
+    from types import UnionType, NoneType
+
+    origin = get_origin(etype)
+
+    if origin is Annotated:
+        return _converter(get_args(etype)[0])
+
+    if origin in (Union, UnionType):
+
+        members = get_args(etype)
+
+        # Values of any member type are passed through
+        checks = tuple(
+            get_origin(m) or m
+            for m in members
+            if isclass(get_origin(m) or m)
+        )
+
+        converters = [c for c in map(_converter, members) if c]
+
+        if not converters:
+            return None
+
+        def convert_union(value):
+
+            if isinstance(value, checks):
+                return value
+
+            for convert in converters:
+                try:
+                    return convert(value)
+                except (TypeError, ValueError):
+                    pass
+
+            raise TypeError(f'Cannot convert {value!r} to {etype}')
+
+        return convert_union
+
+    # list[int] -> list
+    cls = origin or etype
+
+    if (not isclass(cls)) or isabstract(cls) or (cls in (Any, object, NoneType)):
+        return None
+
+    if getattr(cls, '_is_protocol', False):
+        return None
+
+    def convert(value):
+        if isinstance(value, cls):
+            return value
+        else:
+            return cls(value)
+
+    return convert
+
+def _compile(func) -> Callable[[tuple, dict], tuple[tuple | list, dict]]:
+    """Build a function which coerces the (args, kwargs) of a call to func"""
+    from inspect import signature, Parameter
+
+    hints = _hints(func)
+
+    positional: list[None | Converter] = []
+    keyword: dict[str, Converter] = {}
+    var_positional: None | Converter = None
+    var_keyword: None | Converter = None
+
+    # name -> (position, coerced default), for defaults which aren't of the annotated type
+    defaults: dict[str, tuple[None | int, Any]] = {}
+
+    for param in signature(func).parameters.values():
+
+        convert = _converter(hints.get(param.name))
+
+        match param.kind:
+
+            case Parameter.POSITIONAL_ONLY | Parameter.POSITIONAL_OR_KEYWORD:
+                position = len(positional)
+                positional.append(convert)
+
+            case Parameter.VAR_POSITIONAL:
+                var_positional = convert
+                continue
+
+            case Parameter.VAR_KEYWORD:
+                var_keyword = convert
+                continue
+
+            case _:
+                position = None
+
+        if not convert:
+            continue
+
+        if param.kind != Parameter.POSITIONAL_ONLY:
+            keyword[param.name] = convert
+
+        if param.default is not Parameter.empty:
+
+            try:
+                value = convert(param.default)
+
+            except (TypeError, ValueError):
+                # Left as is (`x: int = None`)
+                value = param.default
+
+            if value is not param.default:
+
+                if param.kind == Parameter.POSITIONAL_ONLY:
+                    # Can't be filled in by keyword
+                    positional[position] = None
+                else:
+                    defaults[param.name] = (position, value)
+
+    nargs = len(positional)
+
+    # (position, converter) of positional parameters which are coerced
+    slots = [(x, convert) for x, convert in enumerate(positional) if convert]
+
+    def coerce(args: tuple, kwargs: dict) -> tuple[tuple | list, dict]:
+
+        if slots or (var_positional and len(args) > nargs):
+
+            args = list(args)
+
+            for x, convert in slots:
+                if x >= len(args):
+                    break
+                args[x] = convert(args[x])
+
+            if var_positional:
+                args[nargs:] = map(var_positional, args[nargs:])
+
+        if kwargs:
+            kwargs = {
+                name: (convert(value) if (convert := keyword.get(name, var_keyword)) else value)
+                for name, value in kwargs.items()
+            }
+
+        for name, (position, value) in defaults.items():
+            if (name not in kwargs) and ((position is None) or (position >= len(args))):
+                kwargs[name] = value
+
+        return args, kwargs
+
+    return coerce
+
 def force_in_types(func):
     """
     Forces parameter types
-    
+
+    The signature is analysed once (on the first call),
+    `X | None`, `Optional[X]` & generic annotations (`list[int]` -> list) are supported
+
     EXAMPLE:
     ```
     @force_in_types
     def myfunc(x: int, y: float):
         ...
-    
+
     myfunc('1', '2') -> myfunc(int('1'), float('2'))
     myfunc(3, '4') -> myfunc(3, float('4'))
     """
 
+    # Compiled lazily, since annotations may reference names defined after the function
+    coerce: None | Callable[[tuple, dict], tuple[tuple | list, dict]] = None
+
     @wraps(func)
     def wrapper(*args, **kwargs):
+        nonlocal coerce
 
-        # Bind and apply defaults to arguments
-        bargs = signature(func).bind(*args, **kwargs)
-        bargs.apply_defaults()
+        if coerce is None:
+            coerce = _compile(func)
 
-        # Coerce input parameter types
-        for name, value in bargs.arguments.items():
-            etype = func.__annotations__.get(name)
-            if etype and not isinstance(value, etype):
-                bargs.arguments[name] = etype(value)
+        args, kwargs = coerce(args, kwargs)
+
+        return func(*args, **kwargs)
 
-        # Execute the function with coerced arguments
-        return func(*bargs.args, **bargs.kwargs)
-    
     return wrapper
 
 def force_out_type(func):
     """
     Forces return type
-    
+
     EXAMPLE:
     ```
     @force_out_type
@@ -47,23 +219,22 @@ def force_out_type(func):
     myfunc(1, 2) -> [1, 2]
     """
 
+    convert: None | Converter = None
+    compiled = False
+
     @wraps(func)
     def wrapper(*args, **kwargs):
+        nonlocal convert, compiled
 
-        # Bind and apply defaults to arguments
-        bargs = signature(func).bind(*args, **kwargs)
-        bargs.apply_defaults()
+        if not compiled:
+            convert = _converter(_hints(func).get('return'))
+            compiled = True
 
-        # Execute the function
-        result = func(*bargs.args, **bargs.kwargs)
+        result = func(*args, **kwargs)
 
-        # Coerce the return type if annotated
-        return_type = func.__annotations__.get('return')
-        if return_type and not isinstance(result, return_type):
-            return return_type(result)
+        if convert:
+            return convert(result)
+        else:
+            return result
 
-        return result
-    
     return wrapper
-
-
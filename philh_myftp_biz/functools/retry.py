@@ -0,0 +1,301 @@
+from typing import Callable, Literal, Type
+from collections import deque
+from threading import Lock
+
+class CircuitOpenError(ConnectionError): ...
+
+#=====================================================
+
+class RetryBudget:
+    """
+    Limits retries to a fraction of the calls within a sliding window
+
+    Stops a failing dependency from receiving (tries x calls) requests
+
+    EXAMPLE:
+    ```
+    budget = RetryBudget(ratio=.2)
+
+    budget.deposit() # on every call
+
+    if budget.withdraw(): # before every retry
+        retry()
+    ```
+    """
+
+    def __init__(self,
+        ratio: float = .2,
+        minimum: int = 10,
+        window: float = 60
+    ) -> None:
+
+        self.ratio = ratio
+        """Max retries per call"""
+
+        self.minimum = minimum
+        """Retries which are always allowed within the window"""
+
+        self.window = window
+        """Seconds"""
+
+        self._calls: deque[float] = deque()
+        self._retries: deque[float] = deque()
+        self._lock = Lock()
+
+    def _trim(self, now:float) -> None:
+
+        for stamps in (self._calls, self._retries):
+            while stamps and (stamps[0] <= now - self.window):
+                stamps.popleft()
+
+    def deposit(self) -> None:
+        """Record a call"""
+        from time import monotonic
+
+        now = monotonic()
+
+        with self._lock:
+            self._trim(now)
+            self._calls.append(now)
+
+    def withdraw(self) -> bool:
+        """Record a retry (returns False if the budget is spent)"""
+        from time import monotonic
+
+        now = monotonic()
+
+        with self._lock:
+
+            self._trim(now)
+
+            if len(self._retries) >= self.minimum + (self.ratio * len(self._calls)):
+                return False
+
+            self._retries.append(now)
+            return True
+
+#=====================================================
+
+class CircuitBreaker:
+    """
+    Fails fast while a dependency is down
+
+    closed: calls go through
+    open: calls raise CircuitOpenError (after `threshold` consecutive failures)
+    half-open: after `reset_after` seconds, one trial call goes through,
+               and its outcome closes or re-opens the circuit
+    """
+
+    def __init__(self,
+        name: str,
+        threshold: int = 5,
+        reset_after: float = 30,
+        exc: Type[BaseException] | tuple[Type[BaseException], ...] = Exception
+    ) -> None:
+
+        self.name = name
+        self.threshold = threshold
+        self.reset_after = reset_after
+
+        self.exc = exc
+        """Exceptions which count as failures"""
+
+        self.failures: int = 0
+        self._opened: None | float = None
+        self._trial: bool = False
+        self._lock = Lock()
+
+    @property
+    def state(self) -> Literal['closed', 'open', 'half-open']:
+        from time import monotonic
+
+        if self._opened is None:
+            return 'closed'
+        elif (monotonic() - self._opened) < self.reset_after:
+            return 'open'
+        else:
+            return 'half-open'
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if calls are not allowed"""
+
+        with self._lock:
+
+            match self.state:
+
+                case 'closed':
+                    return
+
+                case 'half-open' if not self._trial:
+                    self._trial = True
+                    return
+
+            raise CircuitOpenError(f'Circuit {self.name!r} is open')
+
+    def success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._opened = None
+            self._trial = False
+
+    def failure(self) -> None:
+        from time import monotonic
+        from ..terminal import Log
+
+        with self._lock:
+
+            self.failures += 1
+
+            if self._trial or (self.failures >= self.threshold):
+
+                if self._opened is None:
+                    Log.WARN(f'Circuit {self.name!r} opened after {self.failures} failures')
+
+                self._opened = monotonic()
+                self._trial = False
+
+    def __call__[R](self,
+        func: Callable[..., R],
+        *args,
+        **kwargs
+    ) -> R:
+
+        self.check()
+
+        try:
+            result = func(*args, **kwargs)
+
+        except self.exc:
+            self.failure()
+            raise
+
+        except BaseException:
+            # Not a failure of the dependency
+            self.success()
+            raise
+
+        self.success()
+
+        return result
+
+_breakers: dict[str, CircuitBreaker] = {}
+_budgets: dict[str, RetryBudget] = {}
+_registry_lock = Lock()
+
+def circuit(name:str, **kwargs) -> CircuitBreaker:
+    """Get (or create) the circuit breaker of a host / endpoint"""
+
+    with _registry_lock:
+
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **kwargs)
+
+        return _breakers[name]
+
+def budget(name:str, **kwargs) -> RetryBudget:
+    """Get (or create) the retry budget of a host / endpoint"""
+
+    with _registry_lock:
+
+        if name not in _budgets:
+            _budgets[name] = RetryBudget(**kwargs)
+
+        return _budgets[name]
+
+#=====================================================
+
+class RetryPolicy:
+    """
+    Retries a function with decorrelated-jitter backoff
+
+    Each delay is random between `base` and 3x the previous delay (capped at `cap`),
+    so workers that failed together don't retry together
+
+    EXAMPLE:
+    ```
+    policy = RetryPolicy(
+        tries = 5,
+        exc = ConnectionError,
+        budget = budget('api.example.com'),
+        breaker = circuit('api.example.com')
+    )
+
+    @policy
+    def fetch(): ...
+
+    policy.call(fetch)
+    ```
+    """
+
+    def __init__(self,
+        tries: int = 3,
+        base: float = .1,
+        cap: float = 30,
+        exc: Type[BaseException] | tuple[Type[BaseException], ...] = Exception,
+        budget: None | RetryBudget = None,
+        breaker: None | CircuitBreaker = None
+    ) -> None:
+
+        self.tries = tries
+        self.base = base
+        self.cap = cap
+        self.exc = exc
+        self.budget = budget
+        self.breaker = breaker
+
+    def delays(self):
+        """Decorrelated jitter delays (seconds)"""
+        from random import uniform
+
+        delay = self.base
+
+        while True:
+            delay = min(self.cap, uniform(self.base, delay * 3))
+            yield delay
+
+    def call[R](self,
+        func: Callable[..., R],
+        *args,
+        **kwargs
+    ) -> R:
+        from time import sleep
+        from ..terminal import Log
+
+        if self.budget:
+            self.budget.deposit()
+
+        delays = self.delays()
+
+        for attempt in range(1, self.tries + 1):
+
+            try:
+                if self.breaker:
+                    return self.breaker(func, *args, **kwargs)
+                else:
+                    return func(*args, **kwargs)
+
+            except CircuitOpenError:
+                raise
+
+            except self.exc:
+
+                if attempt == self.tries:
+                    raise
+
+                if self.budget and not self.budget.withdraw():
+                    raise
+
+                delay = next(delays)
+
+                Log.VERB(f'Retrying in {delay:.2f}s (attempt {attempt}/{self.tries})', exc_info=True)
+
+                sleep(delay)
+
+    def __call__[R](self, func: Callable[..., R]) -> Callable[..., R]:
+        from functools import wraps
+
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> R:
+            return self.call(func, *args, **kwargs)
+
+        return wrapper
@@ -0,0 +1,142 @@
+from typing import Callable, TYPE_CHECKING
+from threading import Event
+
+if TYPE_CHECKING:
+    from ..time import Timeout
+
+class Backoff:
+    """
+    Exponentially growing delays for polling external state
+
+    EXAMPLE:
+    ```
+    delays = Backoff(initial=.01, maximum=1)
+
+    next(delays) -> .01
+    next(delays) -> .02
+    next(delays) -> .04
+    ...
+    next(delays) -> 1
+    ```
+    """
+
+    def __init__(self,
+        initial: float = .01,
+        maximum: float = 1,
+        factor: float = 2,
+        jitter: float = 0
+    ) -> None:
+
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+
+        self.jitter = jitter
+        """Fraction of each delay which is randomized (0 - 1)"""
+
+        self.delay = initial
+
+    def reset(self) -> None:
+        """Start again from the initial delay"""
+        self.delay = self.initial
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> float:
+        from random import uniform
+
+        delay = self.delay
+
+        self.delay = min(self.delay * self.factor, self.maximum)
+
+        if self.jitter:
+            delay *= uniform(1 - self.jitter, 1)
+
+        return delay
+
+    def sleep(self,
+        limit: None | float = None,
+        event: None | Event = None
+    ) -> bool:
+        """
+        Sleep for the next delay (at most limit seconds)
+
+        Wakes up early if the event is set (returns True if it was)
+        """
+        from time import sleep
+
+        delay = next(self)
+
+        if limit is not None:
+            delay = max(0, min(delay, limit))
+
+        if event:
+            return event.wait(delay)
+        else:
+            sleep(delay)
+            return False
+
+def waitfor[R](
+    func: Callable[[], R] | Event,
+    timeout: 'None | float | Timeout' = None,
+    interval: float = .01,
+    max_interval: float = 1,
+    backoff: float = 2,
+    event: None | Event = None,
+    msg: str = ''
+) -> R:
+    """
+    Wait until func returns a truthy value (and return it)
+
+    func is polled with exponential backoff (interval -> max_interval),
+    setting the event re-checks func immediately (the event is then cleared)
+
+    If func is an Event, waits until it is set
+
+    Raises TimeoutError if the timeout (seconds or a time.Timeout) runs out
+
+    EXAMPLE:
+    ```
+    waitfor(lambda: path.exists, timeout=30)
+
+    to = Timeout(60, 'qBitTorrent did not respond')
+    waitfor(torrent_added, timeout=to)
+    ```
+    """
+    from time import monotonic
+
+    if isinstance(func, Event):
+        event = func
+        func = func.is_set
+        notify = False
+    else:
+        notify = (event is not None)
+
+    if timeout is None:
+        deadline = None
+    elif isinstance(timeout, (int, float)):
+        deadline = monotonic() + timeout
+    else:
+        msg = msg or timeout.msg
+        deadline = monotonic() + timeout.remaining
+
+    delays = Backoff(interval, max_interval, backoff)
+
+    while True:
+
+        result = func()
+
+        if result:
+            return result
+
+        if deadline is None:
+            limit = None
+        else:
+            limit = deadline - monotonic()
+
+            if limit <= 0:
+                raise TimeoutError(msg)
+
+        if delays.sleep(limit, event) and notify:
+            event.clear()
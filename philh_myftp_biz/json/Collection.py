@@ -1,8 +1,11 @@
-from typing import Self, Any, cast, Generator, Iterator
-from contextlib import contextmanager
+from typing import Self, Any, cast, Generator, Iterator, TYPE_CHECKING
+from contextlib import contextmanager, nullcontext
 from ..file import _Template as File
 from json import dumps
 
+if TYPE_CHECKING:
+    from ..process import Watcher
+
 class Collection[T, STRUCT]:
 
     _default: STRUCT
@@ -11,6 +14,12 @@ class Collection[T, STRUCT]:
 
     var: File
 
+    _stat: None | tuple[int, int] = None
+    """(size, mtime_ns) of var when _cache was last synced"""
+
+    _version: int = 0
+    """Incremented whenever _cache changes"""
+
     def __init__(self,
         t: STRUCT | File | 'Collection[T, STRUCT]' | Any = None
     ) -> None:
@@ -18,12 +27,12 @@ class Collection[T, STRUCT]:
 
         if isinstance(t, Collection):
             self.var = t.var
-            self._cache = t.var.read()
+            self._reload()
 
         elif isinstance(t, File):
             t.default = self._default
             self.var = t
-            self._cache = t.read()
+            self._reload()
 
         elif isinstance(t, (tuple, filter, GeneratorType)):
             self._cache = cast(STRUCT, list(t))
@@ -38,25 +47,62 @@ class Collection[T, STRUCT]:
 
     def read(self) -> STRUCT:
         from copy import deepcopy
+        self._sync()
         return deepcopy(self._cache)
+
+    def _sync(self) -> None:
+        """Reload the cache if the file was changed by another process"""
+
+        if hasattr(self, 'var') and (self.var.stat != self._stat):
+            self._reload()
+
+    def _reload(self) -> None:
+
+        with self.var.lock(shared=True):
+            self._stat = self.var.stat
+            self._cache = self.var.read()
+
+        self._version += 1
+
+    def _lock(self):
+        if hasattr(self, 'var'):
+            return self.var.lock()
+        else:
+            return nullcontext()
+
+    def watch(self, interval: int|float = 1) -> 'Watcher':
+        """Reload the cache in the background when the file changes"""
+        from ..process import Watcher
+
+        return Watcher(
+            checker = lambda: self.var.stat,
+            handler = self._sync,
+            interval = interval
+        )
     
     @contextmanager
     def handle(self) -> Generator[STRUCT, None, None]:
-        data = self.read()
-        try:
-            yield data
-        finally:
-            self.save(data)
+        with self._lock():
+            data = self.read()
+            try:
+                yield data
+            finally:
+                self.save(data)
     
     def save(self, data: STRUCT | 'Collection[T, STRUCT]') -> None:
 
         if isinstance(data, Collection):
             data = data.read()
 
-        self._cache = data
+        with self._lock():
 
-        if hasattr(self, 'var'):
-            self.var.save(data)
+            self._cache = data
+
+            if hasattr(self, 'var'):
+                self.var.save(data)
+                self._stat = self.var.stat
+
+        self._version += 1
     
     def copy(self) -> Self:
         return self.__class__(self.read())
@@ -0,0 +1,125 @@
+from typing import Callable, Iterable, Any
+from bisect import bisect_left, bisect_right
+
+class Index[V]:
+    """
+    Secondary index for a json.List
+
+    Hash indexes answer exact lookups.
+    Sorted indexes also answer range lookups.
+
+    Created with `List.index_on()`
+    """
+
+    version: int = -1
+    """Version of the list this index was last synced with"""
+
+    def __init__(self,
+        func: Callable[[V], Any],
+        sorted: bool = False
+    ) -> None:
+
+        self.func = func
+        self.sorted = sorted
+
+        self.clear()
+
+    def clear(self) -> None:
+
+        # Hash Index
+        self._table: dict[Any, list[V]] = {}
+
+        # Sorted Index
+        self._keys: list[Any] = []
+        self._items: list[V] = []
+
+    def build(self, items: Iterable[V]) -> None:
+        """Rebuild the index from scratch"""
+
+        self.clear()
+
+        if self.sorted:
+
+            pairs = sorted(
+                ((self.func(item), item) for item in items),
+                key = lambda p: p[0]
+            )
+
+            self._keys = [k for k, _ in pairs]
+            self._items = [i for _, i in pairs]
+
+        else:
+            self.add(items)
+
+    def add(self, items: Iterable[V]) -> None:
+
+        for item in items:
+
+            key = self.func(item)
+
+            if self.sorted:
+                x = bisect_right(self._keys, key)
+                self._keys.insert(x, key)
+                self._items.insert(x, item)
+
+            else:
+                self._table.setdefault(key, []).append(item)
+
+    def remove(self, items: Iterable[V]) -> None:
+
+        for item in items:
+
+            key = self.func(item)
+
+            if self.sorted:
+
+                lo = bisect_left(self._keys, key)
+                hi = bisect_right(self._keys, key)
+
+                for x in range(lo, hi):
+                    if self._items[x] == item:
+                        del self._keys[x]
+                        del self._items[x]
+                        break
+
+            else:
+
+                bucket = self._table.get(key, [])
+
+                if item in bucket:
+                    bucket.remove(item)
+
+                if len(bucket) == 0:
+                    self._table.pop(key, None)
+
+    def get(self, key: Any) -> list[V]:
+        """Get all items matching a key"""
+
+        if self.sorted:
+            lo = bisect_left(self._keys, key)
+            hi = bisect_right(self._keys, key)
+            return self._items[lo:hi]
+
+        else:
+            return list(self._table.get(key, []))
+
+    def range(self,
+        start: Any = None,
+        stop: Any = None
+    ) -> list[V]:
+        """Get all items with (start <= key < stop)"""
+
+        if not self.sorted:
+            raise TypeError('Range lookups require a sorted index')
+
+        if start is None:
+            lo = 0
+        else:
+            lo = bisect_left(self._keys, start)
+
+        if stop is None:
+            hi = len(self._keys)
+        else:
+            hi = bisect_left(self._keys, stop)
+
+        return self._items[lo:hi]
@@ -1,5 +1,7 @@
 from typing import Callable, Any, Self, Iterable, overload, cast
+from functools import cached_property
 from .Collection import Collection
+from .Index import Index
 
 class List[V](Collection[V, list[V]]):
 
@@ -15,26 +17,107 @@ class List[V](Collection[V, list[V]]):
         return self.read()[key]
 
     def extend(self, items: Iterable[V]) -> None:
+        items = list(items)
+        version = self._version
         with self.handle() as data:
             data.extend(items)
+        self._reindex(version, added=items)
 
     def pop(self, i: int = -1, n: int = 1) -> tuple[V, ...]:
+        version = self._version
         with self.handle() as data:
             n = min(n, len(data))
-            return tuple(data.pop(i) for _ in range(n))
+            items = tuple(data.pop(i) for _ in range(n))
+        self._reindex(version, removed=items)
+        return items
 
     def __iadd__(self, value: V) -> Self:
+        version = self._version
         with self.handle() as data:
             data.append(value)
+        self._reindex(version, added=[value])
         return self
     
     def __isub__(self, value: V) -> Self:
+        version = self._version
         with self.handle() as data:
             data.remove(value)
+        self._reindex(version, removed=[value])
         return self
         
     #=======================================
 
+    @cached_property
+    def _indexes(self) -> list[Index[V]]:
+        return []
+
+    def index_on(self,
+        func: Callable[[V], Any],
+        sorted: bool = False
+    ) -> Index[V]:
+        """
+        Create a secondary index for keyed lookups
+
+        EXAMPLE:
+        ```
+        by_name = lst.index_on(lambda x: x['name'])
+        lst.lookup(by_name, 'Phil') -> List([{'name': 'Phil', ...}])
+
+        by_age = lst.index_on(lambda x: x['age'], sorted=True)
+        lst.lookup(by_age, slice(18, 30)) -> List([...])
+        ```
+        """
+
+        index = Index(func, sorted)
+
+        self._indexes.append(index)
+
+        return index
+
+    def lookup(self, index: Index[V], value: Any) -> 'List[V]':
+        """
+        Get all items where index key == value
+
+        If value is a slice, then (start <= key < stop) [Sorted Indexes Only]
+
+        Returns copies, like read()
+        """
+        from copy import deepcopy
+
+        self._sync()
+
+        # Rebuild stale indexes (after bulk changes)
+        if index.version != self._version:
+            index.build(self._cache)
+            index.version = self._version
+
+        if isinstance(value, slice):
+            items = index.range(value.start, value.stop)
+        else:
+            items = index.get(value)
+
+        return List(deepcopy(items))
+
+    def _reindex(self,
+        version: int,
+        added: Iterable[V] = (),
+        removed: Iterable[V] = ()
+    ) -> None:
+        """Incrementally update indexes that were in sync before a change"""
+
+        # The file was reloaded mid-change, leave the indexes stale
+        if self._version != (version + 1):
+            return
+
+        for index in self._indexes:
+
+            if index.version == version:
+                index.remove(removed)
+                index.add(added)
+                index.version = self._version
+
+    #=======================================
+
     def sorted(self, func: Callable[[V], Any] = lambda x: x) -> 'List[V]':
         sdata = sorted(self.read(), key=func)
         return List(sdata)
@@ -1,6 +1,7 @@
 from ..functools.supports import SupportsJSON # pyright: ignore[reportUnusedImport]
 from json import load, loads, dump, dumps # pyright: ignore[reportUnusedImport]
 from .List import List # pyright: ignore[reportUnusedImport]
+from .Index import Index # pyright: ignore[reportUnusedImport]
 from .Dict import Dict # pyright: ignore[reportUnusedImport]
 from .ltable import LookupTable # pyright: ignore[reportUnusedImport]
 from .weights import Weights # pyright: ignore[reportUnusedImport]
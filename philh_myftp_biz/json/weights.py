@@ -1,3 +1,4 @@
+from typing import Callable, Iterable, Any
 
 class Weights:
     """```
@@ -5,7 +6,7 @@ class Weights:
     class WeightsImpl(Weights):
         def TITLE(self, sample, control):
             return (sample == control)
-    
+
     weights = WeightsImpl(
         TITLE = 'MyTitle'
     )
@@ -18,33 +19,123 @@ class Weights:
         TITLE = 'MyTitle'
     ) -> True
 
+    ```
+
+    Keys listed in `weights` are scored instead of required:
+    ```
+
+    class TorrentWeights(Weights):
+        weights = {'SEEDERS': .01}
+        def TITLE(self, sample, control):
+            return (sample == control)
+        def SEEDERS(self, sample, control):
+            return sample
+
+    TorrentWeights(TITLE='MyTitle', SEEDERS=None).rank(
+        [{'TITLE': 'MyTitle', 'SEEDERS': 5}, ...],
+        top_k = 3
+    ) -> [{'TITLE': 'MyTitle', 'SEEDERS': 5}, ...]
+
     ```"""
-    
+
+    weights: dict[str, int|float] = {}
+    """
+    Weight of each scored key (bool or numeric results)
+
+    All other keys are required, and must pass for a sample to be valid
+    """
+
     def __init__(self, **controls):
         self.controls = controls
 
-    def __call__(self, **samples) -> bool:
+    def _checks(self) -> list[tuple[str, Any, Callable[..., Any]]]:
+        """Resolve the check for each key once (required keys first)"""
+
+        checks = [
+            (key, control, getattr(self, key))
+            for key, control in self.controls.items()
+        ]
+
+        # Required keys first, so failures short-circuit
+        checks.sort(key=lambda c: c[0] in self.weights)
+
+        return checks
+
+    def _score(self,
+        checks: list[tuple[str, Any, Callable[..., Any]]],
+        samples: dict[str, Any],
+        verbose: bool
+    ) -> None | float:
+        """Score a sample (None if a required key fails)"""
         from ..terminal import Log
 
-        logm: str = f'Weighing Samples:'
-        valid = True
+        logm: list[str] = ['Weighing Samples:']
+        score = 0
 
-        for key, control in self.controls.items():
+        for key, control, check in checks:
 
             sample = samples[key]
 
-            _valid = getattr(self, key)(
+            result = check(
                 sample = sample,
                 control = control
             )
 
-            valid &= _valid
+            if verbose:
+                logm += [f'{key}={result} | {sample=} | {control=}']
+
+            if key in self.weights:
+                score += self.weights[key] * result
+
+            elif not result:
+                score = None
+                break
+
+        if verbose:
+            logm += [f'{score=}']
+            Log.VERB('\n'.join(logm))
+
+        return score
+
+    def __call__(self, **samples) -> bool:
+        """Check if all required keys pass"""
+        from .. import VERBOSE
+
+        score = self._score(
+            checks = self._checks(),
+            samples = samples,
+            verbose = bool(VERBOSE)
+        )
+
+        return (score is not None)
+
+    def rank(self,
+        samples: Iterable[dict[str, Any]],
+        top_k: None | int = None
+    ) -> list[dict[str, Any]]:
+        """
+        Score many samples in one pass
+
+        Returns the valid samples, highest score first
+        """
+        from heapq import nlargest
+        from .. import VERBOSE
+
+        checks = self._checks()
+        verbose = bool(VERBOSE)
+
+        scored: list[tuple[float, dict[str, Any]]] = []
+
+        for sample in samples:
 
-            logm += f'\n{key}={_valid:d} | {sample=} | {control=}'
+            score = self._score(checks, sample, verbose)
 
-        logm += f'\n{valid=}'
- 
-        Log.VERB(logm)
+            if score is not None:
+                scored += [(score, sample)]
 
-        return valid
+        if top_k is None:
+            scored.sort(key=lambda s: s[0], reverse=True)
+        else:
+            scored = nlargest(top_k, scored, key=lambda s: s[0])
 
+        return [sample for _, sample in scored]
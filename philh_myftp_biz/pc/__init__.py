@@ -27,30 +27,36 @@ def relscan(
         'dst': Path('D:/Child1')
     }]
     """
-    from ..functools import SharedBuffer
+    from ..functools import SharedBuffer, BufferClosedError
     from shutil import copytree
     from ..process import Thread
 
-    buff = SharedBuffer()
-    
-    # Copytree dry run
-    t = Thread(
-
-        func = copytree,
+    buff = SharedBuffer(maxsize=1000)
 
-        src = str(src),
-        dst = str(dst), 
+    def dry_run() -> None:
+        try:
+            copytree(
+                src = str(src),
+                dst = str(dst),
 
-        dirs_exist_ok = True,
-        
-        # Append paths to list instead of directly copying
-        copy_function = lambda s, d, **_: buff.add(PathPair(s, d))
+                dirs_exist_ok = True,
 
-    )
+                # Append paths to the buffer instead of directly copying
+                copy_function = lambda s, d, **_: buff.add(PathPair(s, d))
+            )
+        except BufferClosedError:
+            # The caller stopped early
+            pass
+        finally:
+            buff.close()
 
-    buff.stop_when = lambda: not t.running
+    Thread(dry_run)
 
-    yield from buff
+    try:
+        yield from buff
+    finally:
+        # Unblock the dry run if the caller stops early
+        buff.close()
 
 #========================================================
 # Lazy Values
@@ -0,0 +1,296 @@
+from .SubProcess import Terminals, _command, _parse
+from typing import Literal, TYPE_CHECKING, AsyncIterator, Any
+
+if TYPE_CHECKING:
+    from asyncio.subprocess import Process as AsyncProcess
+    from .SysTask import Process
+    from asyncio import StreamReader, Queue, Task
+    from ..text import UnconsumingIO
+    from ..pc import Path
+
+def _signal(
+    procs: 'list[Process]',
+    method: Literal['terminate', 'kill']
+) -> None:
+    from .SysTask import AccessErrors
+
+    for proc in procs:
+        try:
+            getattr(proc, method)()
+        except AccessErrors:
+            pass
+
+class AsyncSubProcess:
+    """
+    asyncio counterpart of SubProcess (same terminal selection)
+
+    Cancelling a task which is waiting on the process stops the process tree
+
+    EXAMPLE:
+    ```
+    proc = await AsyncSubProcess('ffmpeg', '-i', src, dst, terminal='cmd')
+
+    async for line in proc.lines('err'):
+        ...
+
+    await proc.wait(timeout=600)
+
+    data = (await AsyncSubProcess('script.py', terminal=None)).output('json')
+    ```
+    """
+
+    def __init__(self,
+        *args: 'str|Path',
+        terminal: None | Terminals = 'cmd',
+        dir: 'Path|None' = None,
+        hide: bool = True,
+        max_output: None | int = None
+    ) -> None:
+        """max_output: max characters of output retained per stream (the end is kept)"""
+        from ..text import UnconsumingIO
+
+        self.args = _command(args, terminal)
+        self.dir = dir
+        self.hide = hide
+
+        self.stdout = UnconsumingIO(max_size=max_output)
+        self.stderr = UnconsumingIO(max_size=max_output)
+
+        self._process: 'None | AsyncProcess' = None
+        self._readers: 'list[Task]' = []
+        self._subscribers: 'dict[str, list[Queue[None | list[str]]]]' = {'out': [], 'err': []}
+        self._eof: set[str] = set()
+
+    def __await__(self):
+        return self.start().__await__()
+
+    async def start(self) -> 'AsyncSubProcess':
+        """Start the process (if it hasn't been started)"""
+        from asyncio import create_subprocess_exec, ensure_future
+        from asyncio.subprocess import PIPE
+        from ..terminal import Log
+        from ..pc import cwd
+
+        if self._process is None:
+
+            Log.VERB(f'Running Async Subprocess:\nargs={self.args}\ndir={self.dir}\nhide={self.hide}')
+
+            self._process = await create_subprocess_exec(
+                *self.args,
+                cwd = str(self.dir or cwd()),
+                stdout = PIPE,
+                stderr = PIPE
+            )
+
+            self._readers = [
+                ensure_future(self._read(self._process.stdout, self.stdout, 'out')),
+                ensure_future(self._read(self._process.stderr, self.stderr, 'err'))
+            ]
+
+        return self
+
+    async def _read(self,
+        pipe: 'StreamReader',
+        buffer: 'UnconsumingIO',
+        stream: Literal['out', 'err']
+    ) -> None:
+        """Copy a pipe into a buffer (and to the line subscribers)"""
+        from codecs import getincrementaldecoder
+        from locale import getpreferredencoding
+        from ..terminal import write
+
+        decoder = getincrementaldecoder(getpreferredencoding(False))(errors='ignore')
+
+        # A '\r' which may be the start of a '\r\n'
+        carry = ''
+
+        # Unfinished last line
+        partial = ''
+
+        while True:
+
+            data = await pipe.read(65536)
+
+            text = carry + decoder.decode(data, final=(not data))
+
+            if data and text.endswith('\r'):
+                text, carry = text[:-1], '\r'
+            else:
+                carry = ''
+
+            text = text.replace('\r\n', '\n')
+
+            if text and not self.hide:
+                write(text, stream, True)
+
+            buffer.write(text)
+
+            *lines, partial = (partial + text).split('\n')
+
+            if not data:
+
+                if partial:
+                    lines.append(partial)
+
+                self._eof.add(stream)
+
+            # Consumers subscribed after this point replay these lines from the buffer
+            subscribers = list(self._subscribers[stream])
+
+            for queue in subscribers:
+
+                if lines:
+                    await self._put(stream, queue, lines)
+
+                if not data:
+                    await self._put(stream, queue, None)
+
+            if not data:
+                return
+
+    async def _put(self,
+        stream: Literal['out', 'err'],
+        queue: 'Queue[None | list[str]]',
+        item: None | list[str]
+    ) -> None:
+        # Waits while the consumer's backlog is full (unless it has stopped iterating)
+        if queue in self._subscribers[stream]:
+            await queue.put(item)
+
+    async def lines(self,
+        stream: Literal['out', 'err'] = 'out',
+        backlog: int = 64
+    ) -> AsyncIterator[str]:
+        """
+        Iterate over the lines of a stream (from the start, without line breaks) as they arrive
+
+        backlog: max reads (up to 64KB each) waiting to be consumed
+        (the pipe isn't read while it is full, so memory stays flat)
+        """
+        from asyncio import Queue
+
+        await self.start()
+
+        buffer: 'UnconsumingIO' = getattr(self, 'std'+stream)
+
+        eof = (stream in self._eof)
+
+        # Replay the lines which have already arrived
+        lines = [line.rstrip('\n') for _, line in buffer.lines(partial=eof)]
+
+        queue: 'None | Queue[None | list[str]]' = None
+
+        if not eof:
+            queue = Queue(backlog)
+            self._subscribers[stream].append(queue)
+
+        try:
+
+            for line in lines:
+                yield line
+
+            if queue is not None:
+                while (batch := await queue.get()) is not None:
+                    for line in batch:
+                        yield line
+
+        finally:
+
+            if queue is not None:
+
+                self._subscribers[stream].remove(queue)
+
+                # Release the reader if it is waiting on a full backlog
+                while not queue.empty():
+                    queue.get_nowait()
+
+    @property
+    def running(self) -> bool:
+        return (self._process is not None) and (self._process.returncode is None)
+
+    @property
+    def returncode(self) -> None | int:
+        """Exit code (None while running)"""
+        if self._process:
+            return self._process.returncode
+
+    async def wait(self,
+        timeout: None | float = None
+    ) -> int:
+        """
+        Wait for the process to exit and its output to be read (returns the exit code)
+
+        If the timeout runs out or the waiting task is cancelled, the process tree is stopped
+        """
+        from asyncio import wait_for, gather, shield, CancelledError
+
+        await self.start()
+
+        try:
+            await wait_for(
+                # The readers must outlive a cancelled wait (other line iterators depend on them)
+                gather(self._process.wait(), *map(shield, self._readers)),
+                timeout
+            )
+
+        except TimeoutError:
+            await self.stop()
+            raise TimeoutError(f'Subprocess did not exit within {timeout}s')
+
+        except CancelledError:
+            await self.stop()
+            raise
+
+        return self._process.returncode
+
+    async def stop(self,
+        timeout: float = 5
+    ) -> None:
+        """
+        Stop the process tree
+
+        Processes which haven't exited timeout seconds after they were asked to terminate are killed
+        """
+        from asyncio import to_thread, wait_for
+        from .SysTask import SysTask
+
+        if not self.running:
+            return
+
+        # psutil calls block
+        procs = await to_thread(lambda pid: list(SysTask(pid)), self._process.pid)
+
+        await to_thread(_signal, procs, 'terminate')
+
+        # Collect the exit code, so the transport is closed while the loop is running
+        try:
+            await wait_for(self._process.wait(), timeout)
+
+        except TimeoutError:
+            await to_thread(_signal, procs, 'kill')
+            await self._process.wait()
+
+    def output(self,
+        format: Literal['json', 'hex'] = None,
+        stream: Literal['out', 'err'] = 'out'
+    ) -> 'str | dict | list | bool | Any':
+        """Read the output from the Subprocess"""
+
+        _stream: UnconsumingIO = getattr(self, 'std'+stream)
+
+        return _parse(_stream.read(), format)
+
+async def run_async(
+    *args: 'str|Path',
+    terminal: None | Terminals = 'cmd',
+    dir: 'Path|None' = None,
+    hide: bool = True,
+    timeout: None | float = None
+) -> AsyncSubProcess:
+    """Run a process and wait for it to finish"""
+
+    proc = await AsyncSubProcess(*args, terminal=terminal, dir=dir, hide=hide)
+
+    await proc.wait(timeout)
+
+    return proc
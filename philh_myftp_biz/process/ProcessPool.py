@@ -0,0 +1,312 @@
+from concurrent.futures import Future, Executor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing.shared_memory import SharedMemory
+
+@dataclass(frozen=True)
+class _Shared:
+    """Placeholder for a payload which was moved to shared memory"""
+
+    name: str
+    size: int
+
+    dtype: None | str = None
+    """numpy dtype (None for bytes)"""
+
+    shape: tuple[int, ...] = ()
+
+def _shm(
+    name: None | str = None,
+    size: int = 0,
+    track: bool = True
+) -> 'SharedMemory':
+    """
+    Create (or open, if name is set) a block of shared memory
+
+    track: if the resource tracker unlinks it once this process exits
+    (SharedMemory only takes `track` on python 3.13+, so before that it only applies to created blocks)
+    """
+    from multiprocessing.shared_memory import SharedMemory
+    from sys import version_info
+    import os
+
+    if version_info >= (3, 13):
+        return SharedMemory(name, (name is None), size, track=track)
+
+    shm = SharedMemory(name, (name is None), size)
+
+    # Before 3.13, every block is tracked
+    # (opened blocks are left registered: workers share the tracker of this process, and unlink() unregisters them)
+    if (not track) and (name is None) and (os.name != 'nt'):
+        from multiprocessing.resource_tracker import unregister
+        unregister(shm._name, 'shared_memory')
+
+    return shm
+
+def _share(
+    value: Any,
+    threshold: int,
+    track: bool = True
+) -> 'tuple[Any, None | SharedMemory]':
+    """Move a large bytes-like / numpy value to shared memory"""
+
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        data = memoryview(value).cast('B')
+        dtype, shape = None, ()
+
+    elif (type(value).__module__ == 'numpy') and hasattr(value, 'nbytes') and (value.nbytes >= threshold):
+        from numpy import ascontiguousarray
+        array = ascontiguousarray(value)
+        data = memoryview(array).cast('B')
+        dtype, shape = array.dtype.str, array.shape
+
+    else:
+        return value, None
+
+    if data.nbytes < threshold:
+        return value, None
+
+    shm = _shm(size=max(1, data.nbytes), track=track)
+    shm.buf[:data.nbytes] = data
+
+    return _Shared(shm.name, data.nbytes, dtype, shape), shm
+
+def _unshare(value: Any, unlink: bool = False) -> Any:
+    """Copy a payload out of shared memory"""
+
+    if not isinstance(value, _Shared):
+        return value
+
+    shm = _shm(value.name, track=False)
+
+    try:
+        if value.dtype is None:
+            return bytes(shm.buf[:value.size])
+        else:
+            from numpy import ndarray
+            return ndarray(value.shape, value.dtype, buffer=shm.buf[:value.size]).copy()
+
+    finally:
+        shm.close()
+
+        if unlink:
+            shm.unlink()
+
+def _discard(value: _Shared) -> None:
+    """Free a payload in shared memory without reading it"""
+
+    try:
+        shm = _shm(value.name, track=False)
+    except FileNotFoundError:
+        return
+
+    shm.close()
+    shm.unlink()
+
+def _work(
+    payload: bytes,
+    shared: dict[int | str, _Shared],
+    threshold: int
+) -> bytes | _Shared:
+    """
+    Runs in the worker process
+
+    shared: arguments (by position / keyword) which were moved to shared memory
+    (passed outside of the dill payload, so _Shared is pickled by reference)
+    """
+    from dill import loads, dumps
+
+    func, args, kwargs = loads(payload)
+
+    for key, value in shared.items():
+        if isinstance(key, int):
+            args[key] = _unshare(value)
+        else:
+            kwargs[key] = _unshare(value)
+
+    # Untracked, so it outlives this worker (the parent unlinks it once the result is read)
+    result, shm = _share(func(*args, **kwargs), threshold, track=False)
+
+    if shm:
+        shm.close()
+        return result
+    else:
+        return dumps(result)
+
+class ProcessPool(Executor):
+    """
+    Persistent pool of worker processes
+
+    - Functions, closures & lambdas are serialized with dill
+    - Large bytes / numpy arguments & results (>= shm_threshold bytes) go through shared memory
+    - Workers are replaced after max_tasks_per_child tasks
+
+    Only top-level arguments are moved to shared memory
+    Futures are running once they are submitted (so they can't be cancelled)
+
+    EXAMPLE:
+    ```
+    pool = ProcessPool()
+
+    future = pool.submit(lambda data: sha256(data).hexdigest(), data)
+    future.result()
+
+    MProcess(parse, name).result() # Shared pool
+    ```
+    """
+
+    def __init__(self,
+        max_workers: None | int = None,
+        max_tasks_per_child: None | int = 100,
+        shm_threshold: int = 2**20
+    ) -> None:
+        from os import cpu_count
+
+        self.max_workers = max_workers or cpu_count() or 1
+        self.max_tasks_per_child = max_tasks_per_child
+        self.shm_threshold = shm_threshold
+
+        self._executor: 'None | ProcessPoolExecutor' = None
+        self._lock = Lock()
+
+    @property
+    def executor(self) -> 'ProcessPoolExecutor':
+        """The underlying executor (started on first use)"""
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import get_context
+
+        with self._lock:
+
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers = self.max_workers,
+                    # fork isn't safe with the threads of this process
+                    mp_context = get_context('spawn'),
+                    max_tasks_per_child = self.max_tasks_per_child
+                )
+
+            return self._executor
+
+    def submit[R](self,
+        func: Callable[..., R],
+        *args,
+        **kwargs
+    ) -> Future[R]:
+
+        future = Future()
+
+        self._submit(future, func, args, kwargs)
+
+        return future
+
+    def _submit(self,
+        future: Future,
+        func: Callable,
+        args: tuple,
+        kwargs: dict
+    ) -> None:
+        from concurrent.futures.process import BrokenProcessPool
+        from concurrent.futures import CancelledError
+        from dill import dumps, loads
+
+        args = list(args)
+        kwargs = dict(kwargs)
+
+        shared: dict[int | str, _Shared] = {}
+        blocks: 'list[SharedMemory]' = []
+
+        try:
+
+            for key, value in [*enumerate(args), *kwargs.items()]:
+
+                placeholder, shm = _share(value, self.shm_threshold)
+
+                if shm:
+
+                    shared[key] = placeholder
+                    blocks.append(shm)
+
+                    if isinstance(key, int):
+                        args[key] = None
+                    else:
+                        kwargs[key] = None
+
+            payload = dumps(
+                (func, args, kwargs),
+                # Include the globals the function uses (__main__ isn't run in the workers)
+                recurse = True
+            )
+
+            try:
+                inner = self.executor.submit(_work, payload, shared, self.shm_threshold)
+
+            except BrokenProcessPool:
+                # A worker died, so start a new pool
+                with self._lock:
+                    self._executor = None
+
+                inner = self.executor.submit(_work, payload, shared, self.shm_threshold)
+
+        except BaseException:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+            raise
+
+        def done(inner: Future) -> None:
+
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+            error = None if inner.cancelled() else inner.exception()
+            result = None if (inner.cancelled() or error) else inner.result()
+
+            # Cancelled before it was submitted (the result is never read)
+            if future.cancelled():
+                if isinstance(result, _Shared):
+                    _discard(result)
+                return
+
+            if inner.cancelled():
+                # By shutdown(cancel_futures=True)
+                future.set_exception(CancelledError())
+                return
+
+            if error:
+                future.set_exception(error)
+                return
+
+            try:
+                if isinstance(result, _Shared):
+                    future.set_result(_unshare(result, unlink=True))
+                else:
+                    future.set_result(loads(result))
+
+            except BaseException as e:
+                future.set_exception(e)
+
+        # Work handed to the executor can't be taken back, so the future can't be cancelled from here on
+        if not future.set_running_or_notify_cancel():
+            inner.cancel()
+
+        inner.add_done_callback(done)
+
+    def shutdown(self,
+        wait: bool = True,
+        *,
+        cancel_futures: bool = False
+    ) -> None:
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor:
+            executor.shutdown(wait, cancel_futures=cancel_futures)
+
+pool = ProcessPool()
+"""Shared by every MProcess"""
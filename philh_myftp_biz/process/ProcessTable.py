@@ -0,0 +1,163 @@
+from functools import cached_property
+from threading import Lock
+from typing import Iterator, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .SysTask import Process
+
+class ProcessTable:
+    """
+    Snapshot of the process table
+
+    Built in one pass of psutil.process_iter,
+    so name / pattern / cwd / module lookups are dict lookups instead of a scan.
+
+    EXAMPLE:
+    ```
+    table = ProcessTable.get() # Reused for up to `ttl` seconds
+
+    table.by_name['python.exe'] -> [1234, 5678]
+    table.match('chrome*') -> [...]
+    table.modules[(cwd, 'service')] -> [1234]
+    ```
+    """
+
+    attrs = ['pid', 'name', 'cwd', 'cmdline', 'create_time']
+    """Process attributes read for the snapshot (None where access is denied)"""
+
+    ttl: float = 1
+    """Default seconds a snapshot is reused for"""
+
+    _current: 'None | ProcessTable' = None
+    _lock = Lock()
+
+    def __init__(self) -> None:
+        from psutil import process_iter
+        from time import monotonic
+
+        self.created = monotonic()
+
+        self.by_pid: dict[int, dict[str, Any]] = {}
+        """pid -> process info"""
+
+        self.by_name: dict[str, list[int]] = {}
+        """Lowercase name -> pids"""
+
+        for proc in process_iter(self.attrs, ad_value=None):
+
+            info = proc.info
+
+            self.by_pid[info['pid']] = info
+
+            if info['name']:
+                self.by_name.setdefault(info['name'].lower(), []).append(info['pid'])
+
+    @classmethod
+    def get(cls,
+        ttl: None | float = None
+    ) -> 'ProcessTable':
+        """Get the current snapshot (a new one is taken if it is older than ttl seconds)"""
+        from time import monotonic
+
+        if ttl is None:
+            ttl = cls.ttl
+
+        with cls._lock:
+
+            table = cls._current
+
+            if (table is None) or (monotonic() - table.created >= ttl):
+                table = cls._current = ProcessTable()
+
+            return table
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Take a new snapshot on the next lookup"""
+        with cls._lock:
+            cls._current = None
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken"""
+        from time import monotonic
+        return monotonic() - self.created
+
+    def __len__(self) -> int:
+        return len(self.by_pid)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(self.by_pid.values())
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self.by_pid
+
+    def match(self, pattern: str) -> list[int]:
+        """pids with a name matching a wildcard pattern"""
+        from fnmatch import filter
+
+        return [
+            pid
+            for name in filter(self.by_name, pattern.lower())
+            for pid in self.by_name[name]
+        ]
+
+    @cached_property
+    def by_cwd(self) -> dict[str, list[int]]:
+        """Working directory (Path.path) -> pids"""
+        from ..pc.Path import Path
+
+        index: dict[str, list[int]] = {}
+
+        for info in self:
+            if info['cwd']:
+                index.setdefault(Path._parse(info['cwd']), []).append(info['pid'])
+
+        return index
+
+    @cached_property
+    def modules(self) -> dict[tuple[str, str], list[int]]:
+        """(Working directory (Path.path), module) -> pids of `python -m <module>` processes"""
+        from ..pc.Path import Path
+
+        index: dict[tuple[str, str], list[int]] = {}
+
+        for info in self:
+
+            cmdline: list[str] = info['cmdline'] or []
+
+            if info['cwd'] and ('-m' in cmdline[:-1]):
+
+                name = cmdline[cmdline.index('-m') + 1]
+
+                index.setdefault((Path._parse(info['cwd']), name), []).append(info['pid'])
+
+        return index
+
+    def process(self, pid: int) -> 'None | Process':
+        """
+        Get a live Process from the snapshot
+
+        Returns None if the process has exited (or the pid was reused) since the snapshot
+        """
+        from .SysTask import Process, AccessErrors
+
+        info = self.by_pid.get(pid)
+
+        if info is None:
+            return
+
+        try:
+            proc = Process(pid)
+
+            if (info['create_time'] is not None) and (proc.create_time() != info['create_time']):
+                return
+
+        except AccessErrors:
+            return
+
+        # Reuse what the snapshot already read
+        if info['cmdline'] is not None:
+            proc.__dict__['cmdline'] = info['cmdline']
+
+        return proc
@@ -0,0 +1,208 @@
+from dataclasses import dataclass, fields, astuple
+from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from psutil import Process
+    from .Scheduler import Scheduled
+    from .SysTask import SysTask
+    from ..pc import Path
+
+@dataclass(frozen=True)
+class Sample:
+    """Resource usage of a process tree at one time"""
+
+    time: float
+    """Unix time"""
+
+    processes: int
+
+    cpu: float
+    """CPU % (summed over the tree, so it can exceed 100 on multi-core machines)"""
+
+    rss: int
+    """Resident memory (bytes)"""
+
+    read_bytes: int
+    """Total bytes read by the processes which are running (0 where not supported)"""
+
+    write_bytes: int
+    """Total bytes written by the processes which are running (0 where not supported)"""
+
+    threads: int
+
+def _percentile(values: list[float], p: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    from math import ceil
+
+    return values[max(0, ceil(p / 100 * len(values)) - 1)]
+
+class ResourceSampler:
+    """
+    Record the resource usage of a SysTask tree (the process & its descendants)
+
+    Samples are taken on the shared Scheduler and kept in a ring buffer of the last `size` samples.
+    Each process is read in one psutil oneshot() batch.
+
+    EXAMPLE:
+    ```
+    with ResourceSampler(SysTask('ffmpeg.exe'), interval=.5) as sampler:
+        ...
+
+    sampler.summary()['rss'] -> {'p50': ..., 'p95': ..., 'max': ...}
+    sampler.to_csv('usage.csv')
+    ```
+    """
+
+    def __init__(self,
+        task: 'SysTask | int | str',
+        interval: float = 1,
+        size: int = 3600
+    ) -> None:
+        """task: a SysTask (or its id)"""
+        from .SysTask import SysTask
+
+        if not isinstance(task, SysTask):
+            task = SysTask(task)
+
+        self.task = task
+        self.interval = interval
+
+        self.samples: deque[Sample] = deque(maxlen=size)
+
+        # Reused between samples, since cpu_percent is measured from the previous call
+        self._procs: dict[int, 'Process'] = {}
+
+        self._job: 'None | Scheduled' = None
+
+    def __enter__(self) -> 'ResourceSampler':
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._job and self._job.active)
+
+    def start(self) -> None:
+        """Start sampling every interval seconds"""
+        from psutil import AccessDenied, NoSuchProcess, ZombieProcess
+        from .Scheduler import scheduler
+
+        if not self.running:
+
+            # The first cpu_percent of a process is always 0, so it is read now and the first sample is an interval later
+            for proc in self._track().values():
+                try:
+                    proc.cpu_percent(None)
+                except (NoSuchProcess, ZombieProcess, AccessDenied):
+                    pass
+
+            self._job = scheduler.every(self.interval, self.sample, threaded=True)
+
+    def stop(self) -> None:
+        if self._job:
+            self._job.cancel()
+
+    def _track(self) -> dict[int, 'Process']:
+        """Get the processes of the tree (reusing the ones of the last sample)"""
+
+        procs: dict[int, 'Process'] = {}
+
+        for proc in self.task:
+
+            cached = self._procs.get(proc.pid)
+
+            # Same process (pid not reused)
+            if cached and cached.is_running():
+                procs[proc.pid] = cached
+            else:
+                procs[proc.pid] = proc
+
+        self._procs = procs
+
+        return procs
+
+    def sample(self) -> Sample:
+        """
+        Take a sample now (and record it)
+
+        The cpu of processes which weren't in the last sample is 0
+        """
+        from psutil import AccessDenied, NoSuchProcess, ZombieProcess
+        from time import time
+
+        procs = self._track()
+
+        cpu = 0.
+        rss = read = write = threads = 0
+        count = 0
+
+        for proc in procs.values():
+
+            try:
+                with proc.oneshot():
+
+                    cpu += proc.cpu_percent(None)
+                    rss += proc.memory_info().rss
+                    threads += proc.num_threads()
+
+                    try:
+                        io = proc.io_counters()
+                        read += io.read_bytes
+                        write += io.write_bytes
+                    except (AttributeError, AccessDenied):
+                        pass
+
+                count += 1
+
+            except (NoSuchProcess, ZombieProcess, AccessDenied):
+                pass
+
+        sample = Sample(
+            time = time(),
+            processes = count,
+            cpu = cpu,
+            rss = rss,
+            read_bytes = read,
+            write_bytes = write,
+            threads = threads
+        )
+
+        self.samples.append(sample)
+
+        return sample
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """p50 / p95 / max of every metric"""
+
+        samples = list(self.samples)
+
+        summary: dict[str, dict[str, float]] = {}
+
+        if not samples:
+            return summary
+
+        for field in fields(Sample)[1:]:
+
+            values = sorted(getattr(s, field.name) for s in samples)
+
+            summary[field.name] = {
+                'p50': _percentile(values, 50),
+                'p95': _percentile(values, 95),
+                'max': values[-1]
+            }
+
+        return summary
+
+    def to_csv(self, path: 'Path | str') -> None:
+        """Write the samples to a CSV file"""
+        from ..file import CSV
+        from ..pc import Path
+
+        CSV(Path(path)).save([
+            [field.name for field in fields(Sample)],
+            *(astuple(s) for s in list(self.samples))
+        ])
@@ -0,0 +1,244 @@
+from threading import Condition
+from typing import Callable
+
+class Scheduled:
+    """A call on the Scheduler (see Scheduler.call_later / Scheduler.every)"""
+
+    def __init__(self,
+        scheduler: 'Scheduler',
+        func: Callable,
+        args: tuple,
+        kwargs: dict,
+        interval: None | float,
+        jitter: float,
+        threaded: bool
+    ) -> None:
+
+        self.scheduler = scheduler
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+        self.interval = interval
+        """Seconds between the end of a run and the next one (None if it only runs once)"""
+
+        self.jitter = jitter
+        """Fraction of the interval which is randomized (0 - 1)"""
+
+        self.threaded = threaded
+        """If it runs on the shared ThreadPool (instead of the scheduler thread)"""
+
+        self.due: float = 0
+        """time.monotonic() of the next run"""
+
+        self.runs: int = 0
+
+        self.cancelled: bool = False
+
+        # If it is on the heap
+        self._queued: bool = False
+
+    @property
+    def active(self) -> bool:
+        """If it will run again"""
+        return not self.cancelled
+
+    def cancel(self) -> None:
+        """Stop it from running again (a running call isn't interrupted)"""
+
+        self.scheduler._cancel(self)
+
+    def _delay(self) -> float:
+        from random import uniform
+
+        if self.jitter:
+            return self.interval * uniform(1 - self.jitter, 1 + self.jitter)
+        else:
+            return self.interval
+
+    def _run(self) -> None:
+        from ..terminal import Log
+
+        try:
+            self.func(*self.args, **self.kwargs)
+
+        except Exception:
+            Log.FAIL(f'Exception in scheduled call {self.func!r}', exc_info=True)
+
+        finally:
+
+            self.runs += 1
+
+            if self.interval is None:
+                self.cancelled = True
+            else:
+                self.scheduler._push(self, self._delay())
+
+class Scheduler:
+    """
+    Runs timed calls from a single thread
+
+    Calls run on the scheduler thread, so they should be quick.
+    Slow calls should be `threaded`, so they run on the shared ThreadPool instead of delaying the others.
+
+    The next run of a repeating call is scheduled once the current one ends, so it never overlaps itself.
+    Exceptions are logged and repeating calls keep running.
+
+    EXAMPLE:
+    ```
+    job = scheduler.every(5, refresh, jitter=.1)
+    scheduler.call_later(30, cleanup)
+
+    job.cancel()
+    ```
+    """
+
+    def __init__(self,
+        name: str = 'philh_myftp_biz-scheduler'
+    ) -> None:
+
+        self.name = name
+
+        # (due, sequence, call)
+        self._heap: list[tuple[float, int, Scheduled]] = []
+        self._seq: int = 0
+        self._cancelled: int = 0
+
+        self._cond = Condition()
+        self._started = False
+
+    def __len__(self) -> int:
+        """# of pending calls"""
+        with self._cond:
+            return len(self._heap) - self._cancelled
+
+    def call_later(self,
+        delay: float,
+        func: Callable,
+        *args,
+        threaded: bool = False,
+        **kwargs
+    ) -> Scheduled:
+        """Call a function once, after delay seconds"""
+
+        job = Scheduled(self, func, args, kwargs, None, 0, threaded)
+
+        self._push(job, delay)
+
+        return job
+
+    def every(self,
+        interval: float,
+        func: Callable,
+        *args,
+        jitter: float = 0,
+        delay: None | float = None,
+        threaded: bool = False,
+        **kwargs
+    ) -> Scheduled:
+        """
+        Call a function every interval seconds (until it is cancelled)
+
+        jitter: fraction of the interval which is randomized (0 - 1), so calls started together spread out
+        delay: seconds until the first call (default: interval)
+        threaded: run it on the shared ThreadPool (for slow calls)
+        """
+
+        job = Scheduled(self, func, args, kwargs, interval, jitter, threaded)
+
+        self._push(job, job._delay() if (delay is None) else delay)
+
+        return job
+
+    def _push(self,
+        job: Scheduled,
+        delay: float
+    ) -> None:
+        from heapq import heappush
+        from threading import Thread
+        from time import monotonic
+
+        with self._cond:
+
+            # Cancelled while it was running
+            if job.cancelled:
+                return
+
+            job.due = monotonic() + delay
+            job._queued = True
+
+            self._seq += 1
+            heappush(self._heap, (job.due, self._seq, job))
+
+            if not self._started:
+
+                self._started = True
+
+                Thread(
+                    target = self._main,
+                    name = self.name,
+                    daemon = True
+                ).start()
+
+            self._cond.notify()
+
+    def _cancel(self, job: Scheduled) -> None:
+        """Cancel a call (cancelled calls are only removed from the heap once most of it is cancelled)"""
+        from heapq import heapify
+
+        with self._cond:
+
+            if job.cancelled:
+                return
+
+            job.cancelled = True
+
+            if not job._queued:
+                return
+
+            self._cancelled += 1
+
+            if self._cancelled > len(self._heap) // 2:
+
+                self._heap = [e for e in self._heap if not e[2].cancelled]
+                heapify(self._heap)
+
+                self._cancelled = 0
+
+    def _main(self) -> None:
+        from heapq import heappop
+        from time import monotonic
+        from .Thread import pool
+
+        while True:
+
+            with self._cond:
+
+                while True:
+
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+
+                    delay = self._heap[0][0] - monotonic()
+
+                    if delay <= 0:
+                        break
+
+                    self._cond.wait(delay)
+
+                _, _, job = heappop(self._heap)
+
+                job._queued = False
+
+                if job.cancelled:
+                    self._cancelled -= 1
+                    continue
+
+            if job.threaded:
+                pool.submit(job._run)
+            else:
+                job._run()
+
+scheduler = Scheduler()
+"""Shared by every Watcher / Looper / Timeout"""
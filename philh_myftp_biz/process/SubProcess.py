@@ -1,6 +1,6 @@
-from typing import Literal, TYPE_CHECKING, Any, TypedDict
+from typing import Literal, TYPE_CHECKING, Any, TypedDict, Callable, Iterator, IO
+from ..functools.SharedBuffer import SharedBuffer
 from ..functools import is_iterable
-from .Thread import ThreadedFunc
 from sys import executable
 
 if TYPE_CHECKING:
@@ -47,36 +47,85 @@ TerminalMap: dict[str, Terminal] = {
 
 _TerminalMap = TerminalMap.copy()
 
+type Terminals = Literal['cmd', 'ps', 'psfile', 'py', 'pym', 'vbs']
+
+def _command(
+    args: 'tuple[str|Path, ...]',
+    terminal: None | Terminals
+) -> list[str]:
+    """
+    Prefix args with the terminal
+
+    If terminal is None, it is picked by the extension of the first arg
+    """
+    from ..array import stringify
+    from ..pc import Path
+
+    if isinstance(terminal, str):
+        _terminal = TerminalMap[terminal]
+
+    else:
+        ext = Path(args[0]).ext
+        _terminal = next(
+            (t for t in TerminalMap.values() if (ext in t['exts'])),
+            TerminalMap['cmd']
+        )
+
+    return _terminal['args'] + stringify(args)
+
+def _parse(
+    output: str,
+    format: None | Literal['json', 'hex']
+) -> 'str | dict | list | bool | Any':
+    """Parse the output of a process"""
+    from ..text import hex
+    from .. import json
+
+    if format == 'json':
+        return json.loads(output)
+    
+    elif format == 'hex':
+        return hex.decode(output)
+    
+    else:
+        return output
+
 class SubProcess:
 
     _hide: bool
     _wait: bool
 
+    consumer_output: int = 2**20
+    """Max characters retained per stream once a line consumer is attached (when max_output is None)"""
+
     def __init__(self,
         *args: 'str|Path',
-        terminal: None|Literal['cmd', 'ps', 'psfile', 'py', 'pym', 'vbs'] = 'cmd',
-        dir: 'Path|None' = None
+        terminal: None | Terminals = 'cmd',
+        dir: 'Path|None' = None,
+        timeout: None | float = None,
+        max_output: None | int = None,
+        on_line: None | Callable[[str], None] = None
     ) -> None:
+        """
+        timeout: max seconds to wait for the process (Run/RunHidden)
+        if it runs out, the process tree is stopped and TimeoutError is raised
+
+        max_output: max characters of output retained per stream (the end is kept)
+        (if None, it is unlimited until a line consumer is attached, see consumer_output)
+
+        on_line: called with each line of stdout (see SubProcess.on_line)
+        """
         from subprocess import Popen, PIPE
         from ..text import UnconsumingIO
-        from ..array import stringify
         from .SysTask import SysTask
         from ..terminal import Log
-        from ..pc import Path, cwd
+        from ..pc import cwd
+        from .Thread import Thread
+        from threading import Lock
 
         # =====================================
 
-        if isinstance(terminal, str):
-            _terminal = TerminalMap[terminal]
-
-        elif terminal is None:
-            ext = Path(args[0]).ext
-            _terminal = next(
-                (t for t in TerminalMap.values() if (ext in t['exts'])),
-                TerminalMap['cmd']
-            )
-
-        args = _terminal['args'] + stringify(args)
+        args = _command(args, terminal)
         
         # =====================================
 
@@ -86,81 +135,295 @@ class SubProcess:
             args = args,
             cwd = str(dir or cwd()),
             stdout = PIPE,
-            stderr = PIPE,
-            text = True,
-            errors = 'ignore'
+            stderr = PIPE
         )
 
         self._task = SysTask(self._process.pid)
 
         self.stop = self._task.stop
 
-        self.send = self._process.communicate
-
         # =====================================
 
-        self.stdout = UnconsumingIO(self._process.stdout, False)
-        self.stderr = UnconsumingIO(self._process.stderr, False)
+        self.stdout = UnconsumingIO(max_size=max_output)
+        self.stderr = UnconsumingIO(max_size=max_output)
 
-        # =====================================
+        # Line consumers
+        self._lines_lock = Lock()
+        self._callbacks: dict[str, list[Callable[[str], None]]] = {'out': [], 'err': []}
+        self._subscribers: dict[str, list[SharedBuffer[list[str]]]] = {'out': [], 'err': []}
+        self._eof: set[str] = set()
+
+        if on_line:
+            self.on_line(on_line)
+
+        # Blocking readers (idle until the process writes)
+        self._pumps = [
+            Thread(self._pump, self._process.stdout, self.stdout, 'out'),
+            Thread(self._pump, self._process.stderr, self.stderr, 'err')
+        ]
 
-        if not self._hide:
-            self.__print()
+        # =====================================
 
         # Wait for process to complete if required
         if self._wait:
-            self.wait()
+            try:
+                self.wait(timeout)
+            except TimeoutError:
+                Log.WARN(f'Subprocess timed out after {timeout}s:\n{args=}')
+                self.stop()
+                raise
+
+    def _pump(self,
+        pipe: 'IO[bytes]',
+        buffer: 'UnconsumingIO',
+        stream: Literal['out', 'err']
+    ) -> None:
+        """Copy a pipe into a buffer (and the terminal) as data arrives"""
+        from codecs import getincrementaldecoder
+        from locale import getpreferredencoding
+        from ..terminal import write
+
+        decoder = getincrementaldecoder(getpreferredencoding(False))(errors='ignore')
+
+        # A '\r' which may be the start of a '\r\n'
+        carry = ''
+
+        # Unfinished last line
+        partial = ''
+
+        with pipe:
+
+            while True:
+
+                data = pipe.read1(65536)
+
+                text = carry + decoder.decode(data, final=(not data))
+
+                if data and text.endswith('\r'):
+                    text, carry = text[:-1], '\r'
+                else:
+                    carry = ''
+
+                text = text.replace('\r\n', '\n')
+
+                if text and not self._hide:
+                    write(text, stream, True)
+
+                with self._lines_lock:
+
+                    buffer.write(text)
+
+                    *lines, partial = (partial + text).split('\n')
+
+                    if not data:
+
+                        if partial:
+                            lines.append(partial)
+
+                        self._eof.add(stream)
+
+                    # Consumers registered after this point replay these lines from the buffer
+                    callbacks = list(self._callbacks[stream])
+                    subscribers = list(self._subscribers[stream])
+
+                self._deliver(lines, (not data), callbacks, subscribers)
+
+                if not data:
+                    return
+
+    def _deliver(self,
+        lines: list[str],
+        eof: bool,
+        callbacks: list[Callable[[str], None]],
+        subscribers: 'list[SharedBuffer[list[str]]]'
+    ) -> None:
+        from ..functools.SharedBuffer import BufferClosedError
+        from ..terminal import Log
+
+        for line in lines:
+
+            for callback in callbacks:
+                try:
+                    callback(line)
+                except Exception:
+                    Log.WARN('on_line callback failed', exc_info=True)
+
+        if lines:
+            for sub in subscribers:
+                try:
+                    # Waits while the consumer's backlog is full
+                    sub.add(lines)
+                except BufferClosedError:
+                    pass
+
+        if eof:
+            for sub in subscribers:
+                sub.close()
+
+    def on_line[F: Callable[[str], None]](self,
+        callback: F,
+        stream: Literal['out', 'err'] = 'out'
+    ) -> F:
+        """
+        Call a function with each line of a stream (without its line break) as it arrives
+
+        Runs on the reader thread, so a slow callback slows down the process
+        """
+
+        with self._lines_lock:
+            self._bound(stream)
+            self._callbacks[stream].append(callback)
+
+        return callback
+
+    def _bound(self, stream: Literal['out', 'err']) -> None:
+        """Bound the buffer of a stream a line consumer reads (it gets every line, so only the end is kept)"""
+
+        buffer: UnconsumingIO = getattr(self, 'std'+stream)
+
+        if buffer.max_size is None:
+            buffer.max_size = self.consumer_output
+
+    def iter_lines(self,
+        stream: Literal['out', 'err'] = 'out',
+        backlog: int = 64,
+        replay: bool = True
+    ) -> 'Iterator[str]':
+        """
+        Iterate over the lines of a stream (without line breaks) until the process closes it
+
+        backlog: max reads (up to 64KB each) waiting to be consumed
+        (the process is paused while it is full, so memory stays flat)
+        replay: start with the lines already read (those still retained, see max_output)
+
+        EXAMPLE:
+        ```
+        proc = Start('ffmpeg', ..., max_output=2**20)
+
+        for line in proc.iter_lines('err'):
+            ...
+        ```
+        """
+
+        buffer: UnconsumingIO = getattr(self, 'std'+stream)
+
+        sub: None | SharedBuffer[list[str]] = None
+
+        with self._lines_lock:
+
+            eof = (stream in self._eof)
+
+            if replay:
+                lines = [line.rstrip('\n') for _, line in buffer.lines(partial=eof)]
+            else:
+                lines = []
+
+            if not eof:
+                self._bound(stream)
+                sub = SharedBuffer(backlog)
+                self._subscribers[stream].append(sub)
+
+        try:
+
+            yield from lines
+
+            if sub is not None:
+                for batch in sub:
+                    yield from batch
+
+        finally:
+
+            # Release the reader if the consumer stopped early
+            if sub is not None:
+
+                with self._lines_lock:
+                    self._subscribers[stream].remove(sub)
+
+                sub.close()
 
     @property
     def finished(self) -> bool:
         return (not self.running)
 
+    @property
+    def returncode(self) -> None | int:
+        """Exit code (None while running)"""
+        return self._process.poll()
+
     def output(self,
         format: Literal['json', 'hex'] = None,
         stream: Literal['out', 'err'] = 'out'
     ) -> 'str | dict | list | bool | Any':
         """Read the output from the Subprocess"""
-        from ..text import hex
-        from .. import json
 
         _stream: UnconsumingIO = getattr(self, 'std'+stream)
 
-        output = _stream.read()
-
-        if format == 'json':
-            return json.loads(output)
-        
-        elif format == 'hex':
-            return hex.decode(output)
-        
-        else:
-            return output
+        return _parse(_stream.read(), format)
 
     @property
     def running(self) -> bool:
-        return self._task.exists
+        return (self._process.poll() is None)
     
-    def wait(self):
-        while self.running:
-            pass
+    def wait(self,
+        timeout: None | float = None,
+        tree: bool = False
+    ) -> None:
+        """
+        Wait for the process to exit (raises TimeoutError)
+
+        tree: also wait for the processes it has started (by the time wait is called)
+        """
+        from subprocess import TimeoutExpired
+        from psutil import wait_procs
+        from time import monotonic
+
+        deadline = None if (timeout is None) else (monotonic() + timeout)
+
+        def remaining() -> None | float:
+            if deadline is not None:
+                return max(0, deadline - monotonic())
+
+        # Snapshot the tree before the parent exits (orphans can't be found afterwards)
+        procs = list(self._task) if tree else []
+
+        try:
+            self._process.wait(timeout)
+        except TimeoutExpired as e:
+            raise TimeoutError(f'Subprocess did not exit within {timeout}s') from e
+
+        if procs:
+
+            _, alive = wait_procs(procs, remaining())
+
+            if alive:
+                raise TimeoutError(f'Subprocess tree did not exit within {timeout}s')
+
+        # Collect the remaining output
+        # (processes which inherited the pipes may keep them open)
+        for pump in self._pumps:
+            pump.wait(remaining() if (deadline is not None) else 1)
+
+    def send(self,
+        timeout: None | float = None
+    ) -> tuple[str, str]:
+        """Wait for the process to exit and get (stdout, stderr)"""
+
+        self.wait(timeout)
+
+        return self.stdout.read(), self.stderr.read()
 
     def __getstate__(self):
 
         state = self.__dict__.copy()
 
         state['_process'] = None
-        state['send'] = None
+        state['_pumps'] = []
+        state['_lines_lock'] = None
+        state['_callbacks'] = {'out': [], 'err': []}
+        state['_subscribers'] = {'out': [], 'err': []}
 
         return state
 
-    @ThreadedFunc
-    def __print(self) -> None:
-        from ..terminal import write
-
-        while self.running:
-            write(self.stdout._read(), 'out', True)
-            write(self.stderr._read(), 'err', True)
-
 class Run(SubProcess):
     _hide = False
     _wait = True
@@ -1,4 +1,4 @@
-from psutil import process_iter, NoSuchProcess, AccessDenied
+from psutil import NoSuchProcess, AccessDenied
 from psutil import Process as _Process
 from functools import cached_property
 from cpulimiter import CpuLimiter
@@ -9,13 +9,21 @@ AccessErrors = (AccessDenied, NoSuchProcess)
 def rscan(
     mutable: bool = False
 ):
-    for proc in process_iter():
-        try:
-            p = Process(proc.pid)
-            if (not mutable) or p.is_mutable:
-                yield p
-        except AccessErrors:
-            pass
+    """
+    Iterate over the running processes (from the ProcessTable snapshot)
+
+    mutable: only the processes which can be modified (checked for each process)
+    """
+    from .ProcessTable import ProcessTable
+
+    table = ProcessTable.get()
+
+    for pid in list(table.by_pid):
+
+        p = table.process(pid)
+
+        if p and ((not mutable) or p.is_mutable):
+            yield p
 
 cpu_limiter = CpuLimiter()
 
@@ -115,7 +123,7 @@ class SysTask:
 
     @property
     def _main(self) -> Process|None:
-        from fnmatch import fnmatch
+        from .ProcessTable import ProcessTable
 
         if self.pid:
             try:
@@ -124,14 +132,17 @@ class SysTask:
                 pass
 
         else:
-            for proc in rscan():
 
-                pname = proc.name().lower()
+            table = ProcessTable.get()
+
+            if self.name:
+                pids = table.by_name.get(self.name, [])
+            else:
+                pids = table.match(self.pat)
 
-                if self.name and (self.name == pname):
-                    return Process(proc.pid)
-                elif self.pat and fnmatch(pname, self.pat):
-                    return Process(proc.pid)
+            for pid in pids:
+                if (proc := table.process(pid)):
+                    return proc
 
     def __iter__(self) -> Iterator[Process]:
         
@@ -1,66 +1,297 @@
+from concurrent.futures import Future, Executor
 from dataclasses import dataclass
-from typing import Callable, Any
+from threading import Condition
+from collections import deque
+from typing import Callable, Any, TYPE_CHECKING
 
-class Thread[T]:
+if TYPE_CHECKING:
+    from .ProcessPool import ProcessPool
 
-    result: T
+class ThreadPool(Executor):
+    """
+    Shared pool of daemon worker threads
 
-    @property
-    def _Builder(self):
+    Workers are reused while idle and exit after `idle_timeout` seconds without work.
+    A new worker is only started when every worker is busy (up to max_workers),
+    so long-running tasks (readers, watchers) don't starve short ones.
+
+    Unlike concurrent.futures.ThreadPoolExecutor, workers don't keep the interpreter alive.
+    """
+
+    def __init__(self,
+        max_workers: None | int = None,
+        idle_timeout: float = 60,
+        name: str = 'philh_myftp_biz'
+    ) -> None:
+        from os import cpu_count
+
+        self.max_workers = max_workers or max(256, 32 * (cpu_count() or 1))
+        """
+        Max # of worker threads (tasks are queued once they are all busy)
+
+        Many tasks block for a long time (SubProcess readers, watchers), so it is generous
+        """
+
+        self.idle_timeout = idle_timeout
+        self.name = name
+
+        self._tasks: deque[tuple[Future, Callable, tuple, dict]] = deque()
+        self._cond = Condition()
+        self._shutdown = False
+
+        self.workers: int = 0
+        self.idle: int = 0
+        self.peak: int = 0
+        """Max # of workers at once"""
+
+        self.submitted: int = 0
+        self.completed: int = 0
+        self.failed: int = 0
+
+    def stats(self) -> dict[str, int]:
+        """Pool metrics"""
+
+        with self._cond:
+            return {
+                'workers': self.workers,
+                'active': self.workers - self.idle,
+                'idle': self.idle,
+                'queued': len(self._tasks),
+                'peak': self.peak,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed
+            }
+
+    def submit[R](self,
+        func: Callable[..., R],
+        *args,
+        **kwargs
+    ) -> Future[R]:
+
+        future = Future()
+
+        self._submit(future, func, args, kwargs)
+
+        return future
+
+    def _submit(self,
+        future: Future,
+        func: Callable,
+        args: tuple,
+        kwargs: dict
+    ) -> None:
         from threading import Thread
-        return Thread
+        from ..terminal import Log
+
+        with self._cond:
+
+            if self._shutdown:
+                raise RuntimeError('ThreadPool is shut down')
+
+            self._tasks.append((future, func, args, kwargs))
+            self.submitted += 1
+
+            # Every waiting task needs an idle worker
+            if (self.idle < len(self._tasks)) and (self.workers < self.max_workers):
+
+                self.workers += 1
+                self.peak = max(self.peak, self.workers)
+
+                Thread(
+                    target = self._worker,
+                    name = f'{self.name}-{self.submitted}',
+                    daemon = True
+                ).start()
+
+            else:
+
+                if self.idle < len(self._tasks):
+                    Log.WARN(f'ThreadPool is full ({self.workers} workers), {len(self._tasks)} tasks are queued')
+
+                self._cond.notify()
+
+    def _worker(self) -> None:
+
+        while True:
+
+            with self._cond:
+
+                self.idle += 1
+
+                found = self._cond.wait_for(
+                    lambda: self._tasks or self._shutdown,
+                    self.idle_timeout
+                )
+
+                self.idle -= 1
+
+                if not (found and self._tasks):
+                    self.workers -= 1
+                    return
+
+                future, func, args, kwargs = self._tasks.popleft()
+
+            self._run(future, func, args, kwargs)
+
+    def _run(self,
+        future: Future,
+        func: Callable,
+        args: tuple,
+        kwargs: dict
+    ) -> None:
+        from ..terminal import Log
+
+        # Cancelled while queued
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            result = func(*args, **kwargs)
+
+        except BaseException as e:
+
+            with self._cond:
+                self.failed += 1
+
+            # Threads which are never asked for their result log it at FAIL once they are released
+            Log.VERB(f'Exception in thread task {func!r}', exc_info=True)
+
+            future.set_exception(e)
+
+        else:
+
+            with self._cond:
+                self.completed += 1
+
+            future.set_result(result)
+
+    def shutdown(self,
+        wait: bool = True,
+        *,
+        cancel_futures: bool = False
+    ) -> None:
+        from ..functools.wait import waitfor
+
+        with self._cond:
+
+            self._shutdown = True
+
+            if cancel_futures:
+                while self._tasks:
+                    self._tasks.popleft()[0].cancel()
+
+            self._cond.notify_all()
+
+        if wait:
+            waitfor(lambda: self.workers == 0)
+
+pool = ThreadPool()
+"""Shared by every Thread / ThreadedFunc"""
+
+class Thread[T](Future[T]):
+    """
+    Run a function on the shared ThreadPool
+
+    A Future, so the result (or exception) of the function is available with .result(timeout)
+
+    EXAMPLE:
+    ```
+    t = Thread(download, url)
+
+    t.result(timeout=30) # Raises the exception of the function, if it failed
+    t.cancel() # Only works while it is queued
+
+    Thread.pool.stats() -> {'workers': 4, 'active': 2, ...}
+    ```
+
+    An exception which is never retrieved (result / exception / read) is logged once the Thread is released
+    """
+
+    pool: ThreadPool = pool
+
+    _retrieved: bool = False
 
     def __init__(self,
         func: Callable[..., T],
-        *args: str,
-        **kwargs: str
-    ) -> None: 
+        *args,
+        **kwargs
+    ) -> None:
+        super().__init__()
 
-        self._Builder.run = lambda s: setattr(
-            self, 
-            'result', 
-            s._target(*s._args, **s._kwargs)
-        )
+        self._start(func, args, kwargs)
 
-        # Create new thread
-        self.p = self._Builder(
-            target = func,
-            kwargs = kwargs,
-            args = args
-        )
+    def _start(self,
+        func: Callable[..., T],
+        args: tuple,
+        kwargs: dict
+    ) -> None:
+        """Executor hook"""
+        self.pool._submit(self, func, args, kwargs)
 
-        # Close when main execution ends
-        self.p.daemon = True
+    def result(self,
+        timeout: None | float = None
+    ) -> T:
+        try:
+            return super().result(timeout)
+        finally:
+            if self.done():
+                self._retrieved = True
+
+    def exception(self,
+        timeout: None | float = None
+    ) -> None | BaseException:
+        try:
+            return super().exception(timeout)
+        finally:
+            if self.done():
+                self._retrieved = True
+
+    def __del__(self) -> None:
+        from ..terminal import Log
+
+        if self.done() and (not self.cancelled()) and (not self._retrieved):
+
+            error = self.exception()
 
-        # start the task
-        self.p.start()
+            if error is not None:
+                Log.FAIL(f'Unhandled exception in {type(self).__name__}', exc_info=error)
 
-        self.wait = self.p.join
+    def wait(self,
+        timeout: None | float = None
+    ) -> bool:
+        """Wait up to timeout seconds for the function to finish (returns True if it did)"""
+        from concurrent.futures import wait
 
-        self.running: bool = property(self.p.is_alive)
+        return bool(wait([self], timeout).done)
 
     def read(self,
-        timeout: int,
+        timeout: None | float = None,
         default: T = None
     ) -> T:
-        from ..time import Timeout
+        """Wait up to timeout seconds for the result (default if it isn't finished)"""
 
-        to = Timeout(timeout)
+        if self.wait(timeout):
+            return self.result()
+        else:
+            return default
 
-        while True:
+class MProcess[T](Thread[T]):
+    """
+    Run a function on the shared ProcessPool
 
-            if 'result' in self.__dict__:
-                return self.result
-            
-            elif to.timed_out:
-                return default
+    The function, its arguments & its result are serialized with dill
 
-class MProcess[T](Thread[T]):
+    EXAMPLE:
+    ```
+    MProcess(parse, name).result()
+    ```
+    """
 
     @property
-    def _Builder(self):
-        from multiprocessing import Process
-        return Process
+    def pool(self) -> 'ProcessPool':
+        from .ProcessPool import pool
+        return pool
 
 class Sleeper(Thread[None]):
     """Call a function before exiting after main thread has ended"""
@@ -85,58 +316,88 @@ class Sleeper(Thread[None]):
 
         self.func(*self.args, **self.kwargs)
 
-class Watcher[T](Thread):
+class Watcher[T]:
+    """
+    Call handler when the value of checker changes (checked every interval seconds)
+
+    handler gets the new value if it takes an argument
+
+    Runs on the shared Scheduler, so it doesn't use a thread of its own
+
+    threaded: run the checks on the shared ThreadPool, so a slow handler doesn't delay other scheduled calls
+    (only disable it if the checker & handler are quick)
+    """
 
     def __init__(self,
         checker: Callable[[], T],
         handler: Callable[[T], None],
-        interval: int|float = .3
+        interval: int|float = .3,
+        jitter: float = 0,
+        threaded: bool = True
     ) -> None:
-        
+        from inspect import signature
+        from .Scheduler import scheduler
+
         self.checker = checker
         self.handler = handler
         self.interval = interval
 
-        super().__init__(self._main)
+        try:
+            self._takes_value = len(signature(handler).parameters) > 0
+        except (TypeError, ValueError):
+            self._takes_value = False
 
-    def _main(self) -> None:
-        from inspect import signature
-        from ..time import sleep
+        self._last: T = None
 
-        lvalue: T = None
+        self.job = scheduler.every(interval, self._check, jitter=jitter, threaded=threaded)
 
-        try:
-            params = signature(self.handler).parameters
-        except TypeError:
-            params = []
-        
-        while sleep(self.interval):
+    def _call(self, value: T) -> None:
+        if self._takes_value:
+            self.handler(value)
+        else:
+            self.handler()
 
-            value = self.checker()
+    def _check(self) -> None:
 
-            if value != lvalue:
+        value = self.checker()
 
-                lvalue = value
+        if value != self._last:
+            self._last = value
+            self._call(value)
 
-                if len(params) == 0:
-                    self.handler()
-                else:
-                    self.handler(value)                    
+    @property
+    def running(self) -> bool:
+        return self.job.active
+
+    def stop(self) -> None:
+        self.job.cancel()
 
 class Looper(Watcher):
+    """Call a function every interval seconds"""
 
     def __init__(self,
         func: Callable[[], None],
-        interval: int|float = .3
+        interval: int|float = .3,
+        jitter: float = 0,
+        threaded: bool = True
     ) -> None:
         from ..time import now
 
         super().__init__(
-            checker = now, 
+            checker = now,
             handler = func,
-            interval = interval
+            interval = interval,
+            jitter = jitter,
+            threaded = threaded
         )
 
+    def _check(self) -> None:
+        # No need to compare times
+        if self._takes_value:
+            self.handler(self.checker())
+        else:
+            self.handler()
+
 def Alive() -> bool:
     """Check if the main thread is running"""
     from threading import main_thread
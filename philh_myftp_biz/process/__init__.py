@@ -1,10 +1,22 @@
 
 from .SubProcess import SubProcess, Run, RunHidden, Start, StartHidden, TerminalMap # pyright: ignore[reportUnusedImport]
 
-from .Thread import Thread, MProcess, Sleeper, Watcher, Looper, Alive # pyright: ignore[reportUnusedImport]
+from .AsyncSubProcess import AsyncSubProcess, run_async # pyright: ignore[reportUnusedImport]
+
+from .batch import run_many, Job, CommandError # pyright: ignore[reportUnusedImport]
+
+from .Thread import Thread, ThreadPool, MProcess, Sleeper, Watcher, Looper, Alive # pyright: ignore[reportUnusedImport]
+
+from .ProcessPool import ProcessPool # pyright: ignore[reportUnusedImport]
+
+from .Scheduler import Scheduler, Scheduled # pyright: ignore[reportUnusedImport]
 
 from .SysTask import rscan, Process, SysTask # pyright: ignore[reportUnusedImport]
 
+from .ProcessTable import ProcessTable # pyright: ignore[reportUnusedImport]
+
+from .ResourceSampler import ResourceSampler, Sample # pyright: ignore[reportUnusedImport]
+
 from .pymod import PyModule, modscan # pyright: ignore[reportUnusedImport]
 
 from .Venv import SubVenv  # pyright: ignore[reportUnusedImport]
@@ -0,0 +1,139 @@
+from .SubProcess import Terminals
+from dataclasses import dataclass
+from typing import Iterable, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..functools.retry import RetryPolicy
+    from ..pc import Path
+
+class CommandError(Exception):
+    """A command exited with a non-zero code"""
+
+@dataclass
+class Job:
+    """Result of a command run by run_many"""
+
+    args: tuple['str|Path', ...]
+
+    returncode: None | int = None
+    """None if the command never finished (timeout / failed to start)"""
+
+    stdout: str = ''
+    stderr: str = ''
+
+    tries: int = 0
+
+    error: None | BaseException = None
+    """Exception of the last try"""
+
+    truncated: bool = False
+    """If the captured output was cut down to fit the job's share of max_output (the end is kept)"""
+
+    @property
+    def ok(self) -> bool:
+        return (self.returncode == 0)
+
+def run_many(
+    commands: Iterable[Sequence['str|Path'] | str],
+    *,
+    terminal: None | Terminals = 'cmd',
+    dir: 'Path|None' = None,
+    max_parallel: int = 4,
+    timeout: None | float = None,
+    policy: 'None | RetryPolicy' = None,
+    max_output: None | int = 2**26,
+    label: None | str = None,
+    progress: bool = True
+) -> list[Job]:
+    """
+    Run many commands, at most max_parallel at a time
+
+    Each command is a sequence of args (or a single string)
+
+    timeout: max seconds per try (the process tree is stopped when it runs out)
+    policy: retries failed tries (non-zero exit code / timeout)
+    max_output: max total characters of captured output kept across all jobs
+    (each job keeps the end of its output, up to an equal share split between stdout & stderr)
+    progress: show a ProgressBar
+
+    Returns the jobs in the same order as the commands
+
+    EXAMPLE:
+    ```
+    jobs = run_many(
+        [('ffmpeg', '-i', f, f.with_ext('mp4')) for f in files],
+        max_parallel = 4,
+        timeout = 3600,
+        policy = RetryPolicy(tries=2)
+    )
+
+    failed = [j for j in jobs if not j.ok]
+    ```
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from ..functools.retry import RetryPolicy
+    from ..terminal import Log, ProgressBar
+    from .SubProcess import RunHidden
+
+    jobs = [
+        Job((c,) if isinstance(c, str) else tuple(c))
+        for c in commands
+    ]
+
+    policy = policy or RetryPolicy(tries=1)
+
+    # Every job gets the same share, so early jobs can't starve later ones
+    # (it also bounds the output buffered by the running jobs, since at most len(jobs) run at once)
+    if max_output is None:
+        share = None
+    else:
+        share = max(1, max_output // max(1, len(jobs)) // 2)
+
+    def attempt(job: Job) -> None:
+
+        job.tries += 1
+        job.returncode = None
+
+        proc = RunHidden(
+            *job.args,
+            terminal = terminal,
+            dir = dir,
+            timeout = timeout,
+            max_output = share
+        )
+
+        job.returncode = proc.returncode
+        job.stdout = proc.output()
+        job.stderr = proc.output(stream='err')
+        job.truncated = (proc.stdout.offset > 0) or (proc.stderr.offset > 0)
+
+        if job.returncode != 0:
+            raise CommandError(f'Exit code {job.returncode}: {job.args}')
+
+    def run(job: Job) -> Job:
+
+        try:
+            policy.call(attempt, job)
+            job.error = None
+
+        except Exception as e:
+            job.error = e
+            Log.VERB(f'Command failed after {job.tries} tries: {job.args}', exc_info=True)
+
+        return job
+
+    pbar = ProgressBar(len(jobs), label=label) if progress else None
+
+    with ThreadPoolExecutor(max_parallel) as pool:
+
+        for future in as_completed([pool.submit(run, job) for job in jobs]):
+
+            future.result()
+
+            if pbar:
+                pbar.step()
+
+    if pbar:
+        pbar.stop()
+
+    return jobs
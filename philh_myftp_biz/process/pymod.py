@@ -1,5 +1,5 @@
 from ..functools import force_in_types
-from .SysTask import SysTask, rscan
+from .SysTask import SysTask
 from ..pc.Path import Path
 
 class PyModule(SysTask):
@@ -11,21 +11,21 @@ class PyModule(SysTask):
 
     @property
     def _main(self):
-        from ..array import is_sublist
+        from .ProcessTable import ProcessTable
 
-        sublist = ['-m', self.name]
+        table = ProcessTable.get()
 
-        for proc in rscan():
-            if (proc.cwd == self.cwd) and is_sublist(sublist, proc.cmdline):
+        for pid in table.modules.get((self.cwd.path, self.name), []):
+            if (proc := table.process(pid)):
                 return proc
 
 def modscan():
-    for proc in rscan():
+    from .ProcessTable import ProcessTable
 
-        if (proc.name() == 'python.exe') and ('-m' in proc.cmdline):
+    table = ProcessTable.get()
 
-            name = proc.cmdline[ proc.cmdline.index('-m') + 1 ]
-            mdir = proc.cwd.child(name)
-
-            yield PyModule(mdir)
+    for (cwd, name), pids in table.modules.items():
+        for pid in pids:
+            if table.by_pid[pid]['name'] == 'python.exe':
+                yield PyModule(Path(cwd).child(name))
 
@@ -1,42 +1,215 @@
+from typing import Iterator
+from collections import deque
+from threading import Lock
 from io import StringIO
 from re import compile
 
 ansi_escape = compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])|\x0c')
 
 class UnconsumingIO:
-    
-    def __init__(self, 
+    """
+    Text buffer which can be read any # of times
+
+    Text is kept as a list of chunks, so writes are O(1).
+    If max_size is set, only the last max_size characters are retained.
+
+    If clean is True, ANSI escapes are removed (and everything before a clear-screen is dropped)
+    as text is written, so only new text is ever cleaned.
+    """
+
+    def __init__(self,
         stream: StringIO = None,
-        clean: bool = False
+        clean: bool = False,
+        max_size: None | int = None
     ) -> None:
         self._clean = clean
-        self._buffer = ""
+        self.max_size = max_size
+
+        self._chunks: deque[str] = deque()
+        self._size: int = 0
+
+        self.offset: int = 0
+        """Absolute offset of the first retained character (# of characters dropped)"""
+
+        # Unfinished escape sequence / clear-screen marker at the end of the last write
+        self._pending: str = ''
+
+        # If the last dropped character ended a line
+        self._line_dropped: bool = True
+
+        self._lock = Lock()
 
         if stream:
             self._stream = stream
         else:
             self._stream = StringIO()
 
-        self.write = self._stream.write
+    @property
+    def end(self) -> int:
+        """Absolute offset of the end of the buffer (# of characters written)"""
+        return self.offset + self._size
 
-    def read(self, size=None) -> str:
+    def __len__(self) -> int:
+        return self._size
+
+    def _holdback(self, text:str) -> int:
+        """# of characters at the end of text which may continue in the next write"""
         from ..terminal import _cls_cmd
-    
+
+        # Clear-screen marker
+        lo = max(0, len(text) - len(_cls_cmd) + 1)
+        x = text.rfind(_cls_cmd[0], lo)
+
+        while x != -1:
+
+            if _cls_cmd.startswith(text[x:]):
+                return len(text) - x
+
+            x = text.rfind(_cls_cmd[0], lo, x)
+
+        # Escape sequence
+        x = text.rfind('\x1b', -32)
+
+        if (x != -1) and not ansi_escape.match(text, x):
+            return len(text) - x
+
+        return 0
+
+    def _drop(self, n:int) -> None:
+        """Drop the first n retained characters"""
+
+        self._size -= n
+        self.offset += n
+
+        while n > 0:
+
+            chunk = self._chunks.popleft()
+
+            if len(chunk) > n:
+                self._chunks.appendleft(chunk[n:])
+
+            self._line_dropped = (chunk[min(n, len(chunk)) - 1] == '\n')
+
+            n -= len(chunk)
+
+    def write(self, text:str) -> int:
+        """Append text to the buffer"""
+        from ..terminal import _cls_cmd
+
+        size = len(text)
+
+        with self._lock:
+
+            if self._clean:
+
+                text = self._pending + text
+
+                hold = self._holdback(text)
+
+                if hold:
+                    text, self._pending = text[:-hold], text[-hold:]
+                else:
+                    self._pending = ''
+
+                if _cls_cmd in text:
+                    self._drop(self._size)
+                    text = text.split(_cls_cmd)[-1]
+
+                text = ansi_escape.sub('', text)
+
+            if text:
+                self._chunks.append(text)
+                self._size += len(text)
+
+            if (self.max_size is not None) and (self._size > self.max_size):
+                self._drop(self._size - self.max_size)
+
+        return size
+
+    def read(self, size=None) -> str:
+
         self._read()
 
-        if self._clean:
-            self._buffer = self._buffer.split(_cls_cmd)[-1]
-            self._buffer = ansi_escape.sub('', self._buffer)
+        with self._lock:
+
+            # Join once, so the next read is O(1)
+            if len(self._chunks) > 1:
+                text = ''.join(self._chunks)
+                self._chunks.clear()
+                self._chunks.append(text)
+
+            text = self._chunks[0] if self._chunks else ''
 
         if size is None:
-            return self._buffer
+            return text
         else:
-            return self._buffer[:size]
+            return text[:size]
 
     def _read(self) -> str:
 
         chunk = self._stream.read()
 
-        self._buffer += chunk
+        if chunk:
+            self.write(chunk)
 
         return chunk
+
+    def lines(self,
+        offset: int = 0,
+        partial: bool = False
+    ) -> Iterator[tuple[int, str]]:
+        """
+        Iterate over the lines from an absolute offset
+
+        Yields (end offset, line), so a consumer can continue from the end offset later
+        (lines which have been dropped are skipped)
+
+        partial: include the last line, even if it isn't finished
+
+        EXAMPLE:
+        ```
+        offset = 0
+
+        while running:
+            for offset, line in buffer.lines(offset):
+                ...
+        ```
+        """
+
+        with self._lock:
+            pos = self.offset
+            chunks = list(self._chunks)
+            clipped = (offset < pos) and not self._line_dropped
+
+        start = max(offset, pos)
+
+        # Only join the chunks after the offset
+        tail: list[str] = []
+
+        for chunk in chunks:
+
+            if pos + len(chunk) > start:
+                tail.append(chunk[max(0, start - pos):])
+
+            pos += len(chunk)
+
+        text = ''.join(tail)
+
+        if clipped:
+            # Skip the rest of a partially dropped line
+            x = text.find('\n') + 1 or len(text)
+        else:
+            x = 0
+
+        while x < len(text):
+
+            end = text.find('\n', x)
+
+            if end == -1:
+                if partial:
+                    yield (start + len(text), text[x:])
+                return
+
+            yield (start + end + 1, text[x:end + 1])
+
+            x = end + 1
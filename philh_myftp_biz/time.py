@@ -1,5 +1,4 @@
-from typing import Self, SupportsFloat, SupportsInt, Any
-from .process.Thread import ThreadedFunc
+from typing import Self, SupportsFloat, SupportsInt, Callable, Any
 
 #====================================================
 # Time Zone
@@ -139,15 +138,35 @@ class Timeout(Stopwatch):
     def timed_out(self) -> bool:
         return (self.elapsed >= self.timeout)
 
-    @ThreadedFunc
-    def start(self):
-        self._async = True
-        while self._async:
-            self.check()
-            sleep(.25)
+    @property
+    def remaining(self) -> float:
+        """Seconds until the timeout runs out"""
+        return max(0, self.timeout - self.elapsed)
+
+    def wait[R](self,
+        func: Callable[[], R],
+        **kwargs
+    ) -> R:
+        """
+        Wait until func returns a truthy value (see functools.waitfor)
+
+        Raises TimeoutError if the timeout runs out first
+        """
+        from .functools.wait import waitfor
+
+        return waitfor(func, timeout=self, **kwargs)
+
+    def start(self) -> None:
+        """Raise TimeoutError in the background when the timeout runs out (it is logged)"""
+        from .process.Scheduler import scheduler
+
+        self.stop()
+
+        self._job = scheduler.call_later(self.remaining, self.check)
 
-    def stop(self):
-        self._async = False
+    def stop(self) -> None:
+        if getattr(self, '_job', None):
+            self._job.cancel()
 
     def check(self) -> None:
 
@@ -1,22 +1,70 @@
 from requests.adapters import HTTPAdapter as _HTTPAdapter
 from requests_cache import CachedSession as _CachedSession
 from urllib3.util import Retry as _Retry
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..functools.retry import RetryBudget
+
+retryable_statuses: frozenset[int] = frozenset({408, 425, 429, 500, 502, 503, 504})
+"""Statuses which may succeed when retried (timeouts, rate limits & server errors)"""
 
 class RetryStrat(_Retry):
+    """
+    urllib3 retry strategy with decorrelated-jitter backoff
+
+    Only retries statuses which may succeed when retried (honouring Retry-After),
+    and stops retrying once the budget is spent
+    """
 
     def __init__(self,
         total: int = 0,
-        backoff_factor: int = 1,
-        status_forcelist = range(400, 600),
+        backoff_factor: float = 1,
+        status_forcelist = retryable_statuses,
         allowed_methods = ["GET", "POST"],
+        budget: 'None | RetryBudget' = None,
         **kwargs
-    ): super().__init__(
-        total = total,
-        backoff_factor = backoff_factor, 
-        status_forcelist = status_forcelist, 
-        allowed_methods = allowed_methods, 
-        **kwargs
-    )
+    ):
+        super().__init__(
+            total = total,
+            backoff_factor = backoff_factor, 
+            status_forcelist = status_forcelist, 
+            allowed_methods = allowed_methods, 
+            **kwargs
+        )
+
+        self.budget = budget
+
+        self._prev_backoff: float = backoff_factor
+        self._backoff: None | float = None
+
+    def new(self, **kwargs) -> 'RetryStrat':
+
+        retry = super().new(**kwargs)
+
+        retry.budget = self.budget
+        retry._prev_backoff = self._backoff or self._prev_backoff
+
+        return retry
+
+    def get_backoff_time(self) -> float:
+        from random import uniform
+
+        # First retry is immediate
+        if super().get_backoff_time() == 0:
+            return 0
+
+        if self._backoff is None:
+            self._backoff = min(
+                self.backoff_max,
+                uniform(self.backoff_factor, self._prev_backoff * 3)
+            )
+
+        return self._backoff
+
+    def is_exhausted(self) -> bool:
+        return super().is_exhausted() or \
+            ((self.budget is not None) and (not self.budget.withdraw()))
 
 class Adapter(_HTTPAdapter):
 
@@ -33,10 +81,13 @@ class Session(_CachedSession):
         max_age: int = -1,
         adapter: Adapter = None
     ):
+        from ..functools.cache import caches
         from ..pc import loc
 
+        self._file = loc.cache.child(f'{name}.sqlite').path
+
         super().__init__(
-            cache_name = loc.cache.child(f'{name}.sqlite').path,
+            cache_name = self._file,
             backend = 'sqlite',
             expire_after = max_age
         )
@@ -45,3 +96,30 @@ class Session(_CachedSession):
             self.mount("http://", adapter)
             self.mount("https://", adapter)
 
+        self.stats = caches(
+            name = f'Session:{name}',
+            probe = self._probe
+        )
+
+    def _probe(self) -> dict[str, int]:
+        from os.path import getsize
+
+        try:
+            return {'nbytes': getsize(self._file)}
+        except OSError:
+            return {}
+
+    def request(self, *args, **kwargs):
+        from time import perf_counter
+
+        start = perf_counter()
+
+        response = super().request(*args, **kwargs)
+
+        if getattr(response, 'from_cache', False):
+            self.stats.hit(perf_counter() - start)
+        else:
+            self.stats.miss(perf_counter() - start)
+
+        return response
+
@@ -35,23 +35,30 @@ class qBitTorrent(
         port: int = 8080,
         timeout: int = 3600 # 1 hour
     ) -> None:
-        from qbittorrentapi.exceptions import LoginFailed, Forbidden403Error, APIConnectionError
+        from qbittorrentapi.exceptions import LoginFailed, Forbidden403Error, APIConnectionError, HTTP5XXError
+        from ...functools.retry import circuit, budget
         from ..session import RetryStrat
         from ...time import Timeout
         from random import randint
 
-        infretry = RetryStrat(
-            total = None,
-            connect = None,
-            read = None,
-            status = None,
-            status_forcelist = None
+        self._budget = budget(f'{host}:{port}')
+
+        # Fail fast while qBitTorrent is down, instead of retrying forever
+        self._breaker = circuit(
+            name = f'{host}:{port}',
+            exc = (APIConnectionError, HTTP5XXError)
+        )
+
+        retry = RetryStrat(
+            total = 5,
+            backoff_factor = .5,
+            budget = self._budget
         )
 
         super().__init__(
             host, port, username, password,
             VERIFY_WEBUI_CERTIFICATE = False,
-            HTTPADAPTER_ARGS = {'max_retries': infretry}
+            HTTPADAPTER_ARGS = {'max_retries': retry}
         )
 
         self._timeout = lambda: Timeout(timeout)
@@ -67,6 +74,13 @@ class qBitTorrent(
         except (LoginFailed, Forbidden403Error, APIConnectionError) as e:
             raise ConnectionError from e
 
+    def _request_manager(self, *args, **kwargs):
+        """Every API call goes through the circuit breaker of the host"""
+
+        self._budget.deposit()
+
+        return self._breaker(super()._request_manager, *args, **kwargs)
+
     @Log.on_call
     def clear(self,
         rm_files: bool = True,
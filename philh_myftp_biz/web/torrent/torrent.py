@@ -68,11 +68,10 @@ class Torrent:
         self.raw.setForceStart(True)
 
         try:
-            
-            while len(self.raw.files) == 0:
-                to.check()
 
-            return tuple(TorrentFile(self, f.id) for f in self.raw.files)
+            files = to.wait(lambda: self.raw.files)
+
+            return tuple(TorrentFile(self, f.id) for f in files)
         
         except TimeoutError, TorrentNotFoundError:
             return ()
@@ -141,14 +140,7 @@ class Torrent:
         except TorrentNotFoundError:
             qbit.torrents_add(self.url)
         
-        to = qbit._timeout()
-
-        while True:
-            try: 
-                self.raw
-                return
-            except TorrentNotFoundError: 
-                to.check()
+        qbit._timeout().wait(lambda: self.exists)
 
     #===================================================
 
@@ -1,10 +1,14 @@
-from typing import TYPE_CHECKING
+from ..functools.cache.flight import FileFlight
 from ..json import SupportsJSON
+from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from requests import Response
     from ..pc import Path
 
+_flight = FileFlight('URL')
+"""Deduplicates concurrent requests for the same cached page"""
+
 class URL:
     
     def __init__(self, 
@@ -17,22 +21,31 @@ class URL:
         timeout: None|int = 30
     ) -> None:
         from .session import Session, Adapter, RetryStrat
+        from ..functools.retry import circuit, budget
         from urllib.parse import urlparse, parse_qsl
 
         self.url = url.split('?')[0]
         self.params  = params.copy()
         self.headers = headers.copy()
         self.timeout = timeout
+        self.max_age = max_age
         self._parsed = urlparse(url)
         self.addr = (self._parsed.netloc or url)
 
         if '?' in url:
             self.params |= parse_qsl(url.split('?', 1)[1])
 
+        # Shared by every URL of the host
+        self._budget = budget(self.addr)
+        self._breaker = circuit(self.addr)
+
         self._session = Session(
             name = 'URL', 
             max_age = max_age, 
-            adapter = Adapter(RetryStrat(total=max_tries))
+            adapter = Adapter(RetryStrat(
+                total = max_tries,
+                budget = self._budget
+            ))
         )
 
         self.kwargs = {
@@ -40,6 +53,7 @@ class URL:
             'params': self.params.copy(),
             'headers': self.headers.copy(),
             'max_tries': max_tries,
+            'max_age': max_age,
             'timeout': timeout
         }.copy()
 
@@ -129,8 +143,12 @@ class URL:
         return int(self.head.headers.get('Content-Length', 0))
 
     def get(self, **kwargs) -> 'Response':
-        """requests.get Wrapper"""
-        from requests import exceptions
+        """
+        requests.get Wrapper
+
+        Concurrent requests for the same cached page (across threads & processes)
+        wait for the first one, and are then served from the session cache
+        """
         from ..terminal import Log
 
         Log.VERB(
@@ -141,8 +159,29 @@ class URL:
             f'{self.headers=}'
         )
 
+        # Streams & uncached pages
+        if kwargs or (self.max_age == 0):
+            return self._get(**kwargs)
+
+        return _flight(
+            (self.furl, tuple(sorted(self.headers.items()))),
+            self._get
+        )
+
+    def _get(self, **kwargs) -> 'Response':
+        """
+        Request the page
+
+        Raises CircuitOpenError without requesting, while the host keeps failing
+        """
+        from requests import exceptions
+        from .session import retryable_statuses
+
+        self._breaker.check()
+        self._budget.deposit()
+
         try:
-            return self._session.get(
+            response = self._session.get(
                 url = self.url,
                 params = self.params,
                 headers = self.headers,
@@ -150,12 +189,27 @@ class URL:
                 allow_redirects = True,
                 **kwargs
             )
+
         except exceptions.RetryError as e:
+            self._breaker.failure()
             raise TimeoutError() from e
         
         except exceptions.ConnectionError as e:
+            self._breaker.failure()
             raise ConnectionError() from e
 
+        except BaseException:
+            # Not a failure of the host (the outcome is still recorded, so a half-open trial is released)
+            self._breaker.success()
+            raise
+
+        if response.status_code in retryable_statuses:
+            self._breaker.failure()
+        else:
+            self._breaker.success()
+
+        return response
+
     @property
     def online(self) -> bool:
         """ping3.ping wrapper"""